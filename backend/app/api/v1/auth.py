@@ -2,15 +2,17 @@
 Authentication endpoints for user registration, login, and token management.
 """
 import logging
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+import time
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_async_db
-from app.core.auth import create_access_token, create_refresh_token, verify_token
-from app.core.deps import get_current_user
+from app.core.auth import (
+    create_access_token, create_refresh_token, get_token_id, invalidate_token, verify_token
+)
+from app.core.deps import bearer_token, get_current_user
 from app.core.redis_client import token_blacklist
-from app.core.rate_limiting import check_authentication_rate_limit
+from app.core.user_cache import invalidate_user, user_response_cache
+from app.core.rate_limiting import check_authentication_rate_limit, check_user_rate_limit
 from app.services.user_service import UserService
 from app.models.user import User
 from app.schemas.auth import (
@@ -34,7 +36,9 @@ from app.schemas import ErrorResponse, ValidationErrorResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-security = HTTPBearer()
+
+# Access token lifetime in seconds, reported to clients as ``expires_in``
+ACCESS_TOKEN_EXPIRES_IN = settings.ACCESS_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 
 
 @router.post(
@@ -150,7 +154,7 @@ async def register_user(
         logger.info("User registered successfully: %s", user.email)
         
         return UserRegistrationResponse(
-            user=UserResponse.from_orm(user),
+            user=UserResponse.model_validate(user),
             message="User registered successfully. Please verify your email before logging in."
         )
         
@@ -178,7 +182,7 @@ async def login_user(
     """
     # Check rate limit
     try:
-        await check_authentication_rate_limit(request, "login")
+        await check_authentication_rate_limit(request, "login", account=login_data.email)
     except RateLimitError as e:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -192,21 +196,20 @@ async def login_user(
         user = await user_service.authenticate_user(login_data)
         
         # Create tokens
-        access_token = create_access_token(data={"sub": str(user.id)})
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
-        
-        # Calculate token expiration
-        expires_in = settings.ACCESS_TOKEN_EXPIRE_DAYS * 24 * 60 * 60  # Convert to seconds
+        token_data = {"sub": str(user.id)}
+        access_token = create_access_token(data=token_data)
+        refresh_token = create_refresh_token(data=token_data)
         
         logger.info("User logged in successfully: %s", user.email)
         
-        return LoginResponse(
-            user=UserResponse.from_orm(user),
-            tokens=TokenResponse(
+        # Token fields are server-generated, so skip re-validating them
+        return LoginResponse.model_construct(
+            user=UserResponse.model_validate(user),
+            tokens=TokenResponse.model_construct(
                 access_token=access_token,
                 refresh_token=refresh_token,
                 token_type="bearer",
-                expires_in=expires_in
+                expires_in=ACCESS_TOKEN_EXPIRES_IN
             ),
             message="Login successful"
         )
@@ -245,6 +248,13 @@ async def refresh_token(
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
+        if await token_blacklist.is_token_revoked(refresh_data.refresh_token, payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(
@@ -253,6 +263,15 @@ async def refresh_token(
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
+        try:
+            check_user_rate_limit(user_id, "refresh")
+        except RateLimitError as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=e.message,
+                headers={"Retry-After": str(e.details.get("retry_after", 60))}
+            )
+        
         # Verify user still exists and is active
         user_service = UserService(db)
         user = await user_service.get_user_by_id(user_id)
@@ -266,15 +285,14 @@ async def refresh_token(
         
         # Create new access token
         access_token = create_access_token(data={"sub": str(user.id)})
-        expires_in = settings.ACCESS_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
         
         logger.info("Token refreshed for user: %s", user.email)
         
-        return TokenResponse(
+        return TokenResponse.model_construct(
             access_token=access_token,
             refresh_token=refresh_data.refresh_token,  # Return same refresh token
             token_type="bearer",
-            expires_in=expires_in
+            expires_in=ACCESS_TOKEN_EXPIRES_IN
         )
         
     except HTTPException:
@@ -291,7 +309,7 @@ async def refresh_token(
 async def logout_user(
     logout_data: LogoutRequest,
     current_user: User = Depends(get_current_user),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    access_token: str = Depends(bearer_token)
 ):
     """
     Logout user and invalidate tokens.
@@ -299,34 +317,32 @@ async def logout_user(
     Blacklists the current access token and optionally the refresh token.
     """
     try:
-        # Get the access token from authorization header
-        access_token = credentials.credentials
+        current_time = int(time.time())
+        tokens_to_blacklist = {}
         
-        # Calculate TTL for token blacklisting (time until token expires)
+        # Blacklist by jti for the time remaining until the token expires
         payload = verify_token(access_token, token_type="access")
+        invalidate_token(access_token)
         if payload:
-            exp = payload.get("exp", 0)
-            current_time = int(datetime.utcnow().timestamp())
-            ttl = max(exp - current_time, 0)
-            
-            # Blacklist access token
-            await token_blacklist.add_token(access_token, ttl)
-            logger.info("Access token blacklisted for user: %s", current_user.email)
+            token_id = get_token_id(access_token, payload)
+            tokens_to_blacklist[token_id] = max(payload.get("exp", 0) - current_time, 0)
         
         # Blacklist refresh token if provided
         if logout_data.refresh_token:
-            try:
-                refresh_payload = verify_token(logout_data.refresh_token, token_type="refresh")
-                if refresh_payload:
-                    exp = refresh_payload.get("exp", 0)
-                    current_time = int(datetime.utcnow().timestamp())
-                    ttl = max(exp - current_time, 0)
-                    
-                    await token_blacklist.add_token(logout_data.refresh_token, ttl)
-                    logger.info("Refresh token blacklisted for user: %s", current_user.email)
-            except Exception as e:
-                logger.warning("Failed to blacklist refresh token: %s", e)
+            refresh_payload = verify_token(logout_data.refresh_token, token_type="refresh")
+            invalidate_token(logout_data.refresh_token)
+            if refresh_payload:
+                token_id = get_token_id(logout_data.refresh_token, refresh_payload)
+                tokens_to_blacklist[token_id] = max(refresh_payload.get("exp", 0) - current_time, 0)
         
+        if tokens_to_blacklist:
+            await token_blacklist.add_tokens(tokens_to_blacklist)
+            logger.info(
+                "Blacklisted %d token(s) for user: %s",
+                len(tokens_to_blacklist), current_user.email
+            )
+        
+        invalidate_user(current_user.id)
         logger.info("User logged out: %s", current_user.email)
         
         return LogoutResponse(
@@ -350,10 +366,14 @@ async def get_current_user_profile(
     
     Returns authenticated user's profile data.
     Requires valid authentication token.
+    Serialized profiles are cached per user until the row is updated.
     """
     try:
         logger.info("Profile accessed by user: %s", current_user.email)
-        return UserResponse.from_orm(current_user)
+        return Response(
+            content=user_response_cache.get_or_serialize(current_user),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.error("Error getting user profile: %s", e)
@@ -375,6 +395,16 @@ async def change_password(
     Validates current password and updates to new password.
     Requires authentication and current password verification.
     """
+    # Check rate limit
+    try:
+        check_user_rate_limit(str(current_user.id), "change_password")
+    except RateLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.message,
+            headers={"Retry-After": str(e.details.get("retry_after", 60))}
+        )
+    
     user_service = UserService(db)
     
     try:
@@ -2,10 +2,11 @@
 Health check endpoints for monitoring database and service status.
 """
 import logging
+from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.core.database import get_async_db, check_database_connection
+from app.core.database import get_health_db, check_database_connection
 from app.schemas.common import HealthCheckResponse
 from app.core.metrics import (
     track_health_check_metrics,
@@ -16,6 +17,39 @@ from app.core.circuit_breaker import health_check_circuit_breaker, CircuitBreake
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Live pool counters reported by /health/detailed: (response key, pool method)
+POOL_INTROSPECTION_FUNCS = (
+    ("current_size", "size"),
+    ("checked_in", "checkedin"),
+    ("checked_out", "checkedout"),
+)
+
+
+@lru_cache(maxsize=4)
+def _resolve_pool_introspection(pool) -> tuple:
+    """
+    Resolve static pool information and counter methods once per pool.
+    
+    Args:
+        pool: SQLAlchemy connection pool
+        
+    Returns:
+        Tuple of (static pool status dict, ((key, bound method), ...))
+    """
+    # Async pools have different attributes
+    static_status = {
+        "size": getattr(pool, '_pool_size', 'unknown'),
+        "max_overflow": getattr(pool, '_max_overflow', 'unknown'),
+        "pool_class": pool.__class__.__name__,
+        "status": "operational"
+    }
+    funcs = tuple(
+        (key, getattr(pool, name))
+        for key, name in POOL_INTROSPECTION_FUNCS
+        if hasattr(pool, name)
+    )
+    return static_status, funcs
+
 
 @router.get("/health", response_model=HealthCheckResponse)
 @track_health_check_metrics("basic")
@@ -69,14 +103,14 @@ async def database_health_check():
 
 @router.get("/health/detailed", response_model=dict)
 @track_health_check_metrics("detailed")
-async def detailed_health_check(db: AsyncSession = Depends(get_async_db)):
+async def detailed_health_check(db: AsyncSession = Depends(get_health_db)):
     """
     Detailed health check endpoint with comprehensive metrics.
     Provides system status including database metrics and circuit breaker stats.
     """
     try:
         # Test database connection
-        await db.execute(text("SELECT 1"))
+        await db.scalar(text("SELECT 1"))
 
         # Update connection pool metrics
         update_connection_pool_metrics()
@@ -86,22 +120,14 @@ async def detailed_health_check(db: AsyncSession = Depends(get_async_db)):
         engine = get_async_engine()
         pool = engine.pool
 
-        # Get available pool metrics (async pools have different attributes)
-        pool_status = {
-            "size": getattr(pool, '_pool_size', 'unknown'),
-            "max_overflow": getattr(pool, '_max_overflow', 'unknown'),
-            "pool_class": pool.__class__.__name__,
-            "status": "operational"
-        }
+        # Get available pool metrics
+        static_status, pool_funcs = _resolve_pool_introspection(pool)
+        pool_status = dict(static_status)
         
         # Try to get additional metrics if available
         try:
-            if hasattr(pool, 'size'):
-                pool_status["current_size"] = pool.size()
-            if hasattr(pool, 'checked_in'):
-                pool_status["checked_in"] = pool.checkedin()
-            if hasattr(pool, 'checked_out'):
-                pool_status["checked_out"] = pool.checkedout()
+            for key, func in pool_funcs:
+                pool_status[key] = func()
         except Exception:  # pylint: disable=broad-except
             # Some methods might not be available on async pools
             pass
@@ -1,8 +1,15 @@
 """
 Prometheus metrics endpoint for observability.
 """
+import os
+import time
+from functools import lru_cache
+from typing import Iterator
 from fastapi import APIRouter, Response
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from fastapi.responses import StreamingResponse
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.multiprocess import MultiProcessCollector
+from app.core.config import settings
 from app.core.metrics import update_connection_pool_metrics
 import logging
 
@@ -10,21 +17,70 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+class _MetricFamily:
+    """Single collected metric family exposed through the registry interface."""
+    
+    def __init__(self, family):
+        self.family = family
+    
+    def collect(self):
+        return (self.family,)
+
+
+@lru_cache(maxsize=1)
+def _scrape_registry() -> CollectorRegistry:
+    """
+    Get the registry to expose on scrape.
+    
+    In multiprocess mode the worker-local registry only sees this worker, so
+    a separate registry merges every worker's metric files when collected.
+    Merging happens only on scrape, never on the recording path.
+    
+    Returns:
+        Registry to collect from
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
+
+def _iter_exposition() -> Iterator[bytes]:
+    """
+    Serialize registry metrics one family at a time.
+    
+    Yields:
+        Prometheus exposition text for each metric family
+        
+    Raises:
+        Exception: Collection errors are re-raised; the status line is
+            already sent, so this aborts the response and the scrape fails
+            instead of recording a silently truncated one
+    """
+    try:
+        for family in _scrape_registry().collect():
+            yield generate_latest(_MetricFamily(family))
+    except Exception as e:
+        logger.error("Failed to generate metrics: %s", e)
+        raise
+
+
 @router.get("/metrics")
 async def get_metrics():
     """
     Prometheus metrics endpoint.
     Returns metrics in Prometheus exposition format.
+    
+    The payload is streamed per metric family rather than built in memory.
     """
     try:
-        # Update connection pool metrics before serving
-        update_connection_pool_metrics()
-        
-        # Generate Prometheus metrics
-        metrics_data = generate_latest()
+        # Refresh connection pool gauges at most once per scrape interval
+        update_connection_pool_metrics(max_age=settings.PROMETHEUS_SCRAPE_INTERVAL)
         
-        return Response(
-            content=metrics_data,
+        return StreamingResponse(
+            _iter_exposition(),
             media_type=CONTENT_TYPE_LATEST
         )
         
@@ -37,49 +93,86 @@ async def get_metrics():
         )
 
 
+def _collect_samples(metric) -> tuple[dict, float]:
+    """
+    Collect a metric's samples in columnar form.
+    
+    Args:
+        metric: Prometheus metric to collect
+        
+    Returns:
+        Tuple of ({"names", "labels", "values"} parallel lists, sum of values)
+    """
+    names, labels, values = [], [], []
+    total = 0.0
+    for family in metric.collect():
+        for sample in family.samples:
+            names.append(sample.name)
+            labels.append(sample.labels)
+            values.append(sample.value)
+            total += sample.value
+    return {"names": names, "labels": labels, "values": values}, total
+
+
+@lru_cache(maxsize=1)
+def _health_metrics_snapshot(time_bucket: int) -> dict:
+    """
+    Build the health metrics payload, cached per one-second time bucket.
+    
+    Args:
+        time_bucket: Whole seconds of monotonic time, used as the cache key
+        
+    Returns:
+        Health metrics payload
+    """
+    from app.core.circuit_breaker import health_check_circuit_breaker, database_circuit_breaker
+    from app.core.metrics import (
+        health_checks_total, 
+        db_connections_total,
+        db_queries_total,
+        db_retry_attempts_total
+    )
+    
+    # Update connection pool metrics
+    update_connection_pool_metrics()
+    
+    health_check_samples, total_calls = _collect_samples(health_checks_total)
+    db_connection_samples, total_connections = _collect_samples(db_connections_total)
+    db_query_samples, total_queries = _collect_samples(db_queries_total)
+    db_retry_samples, total_retries = _collect_samples(db_retry_attempts_total)
+    
+    return {
+        "health_checks": {
+            "samples": health_check_samples,
+            "total_calls": total_calls
+        },
+        "database": {
+            "connection_samples": db_connection_samples,
+            "query_samples": db_query_samples,
+            "retry_samples": db_retry_samples,
+            "total_connections": total_connections,
+            "total_queries": total_queries,
+            "total_retries": total_retries
+        },
+        "circuit_breakers": {
+            "health_check": health_check_circuit_breaker.get_stats(),
+            "database": database_circuit_breaker.get_stats(),
+        }
+    }
+
+
 @router.get("/metrics/health")
 async def get_health_metrics():
     """
     Get health-specific metrics in JSON format.
     Useful for debugging and dashboards.
+    
+    Samples are returned as parallel ``names``/``labels``/``values`` lists,
+    and the payload is rebuilt at most once per second.
     """
     try:
-        from app.core.circuit_breaker import health_check_circuit_breaker, database_circuit_breaker
-        from app.core.metrics import (
-            health_checks_total, 
-            db_connections_total,
-            db_queries_total,
-            db_retry_attempts_total
-        )
-        
-        # Update connection pool metrics
-        update_connection_pool_metrics()
-        
-        # Get metric values using proper Counter collection method
-        health_check_samples = list(health_checks_total.collect())[0].samples
-        db_connection_samples = list(db_connections_total.collect())[0].samples
-        db_query_samples = list(db_queries_total.collect())[0].samples
-        db_retry_samples = list(db_retry_attempts_total.collect())[0].samples
-        
-        return {
-            "health_checks": {
-                "samples": [{"name": s.name, "labels": s.labels, "value": s.value} for s in health_check_samples],
-                "total_calls": sum(s.value for s in health_check_samples)
-            },
-            "database": {
-                "connection_samples": [{"name": s.name, "labels": s.labels, "value": s.value} for s in db_connection_samples],
-                "query_samples": [{"name": s.name, "labels": s.labels, "value": s.value} for s in db_query_samples],
-                "retry_samples": [{"name": s.name, "labels": s.labels, "value": s.value} for s in db_retry_samples],
-                "total_connections": sum(s.value for s in db_connection_samples),
-                "total_queries": sum(s.value for s in db_query_samples),
-                "total_retries": sum(s.value for s in db_retry_samples)
-            },
-            "circuit_breakers": {
-                "health_check": health_check_circuit_breaker.get_stats(),
-                "database": database_circuit_breaker.get_stats(),
-            }
-        }
+        return _health_metrics_snapshot(int(time.monotonic()))
 
     except Exception as e:
         logger.error("Failed to get health metrics: %s", e)
-        return {"error": f"Failed to get health metrics: {e}"}
\ No newline at end of file
+        return {"error": f"Failed to get health metrics: {e}"}
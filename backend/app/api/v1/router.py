@@ -1,7 +1,8 @@
 """
 API v1 router - Main router for version 1 of the API.
 """
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 from app.api.v1.health import router as health_router
 from app.api.v1.metrics import router as metrics_router
 from app.api.v1.auth import router as auth_router
@@ -18,24 +19,28 @@ api_router.include_router(metrics_router, tags=["metrics"])
 # Include authentication routes
 api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 
+# API v1 root payload, serialized once at import
+API_ROOT_RESPONSE = orjson.dumps({
+    "message": "Defeah Marketing API v1",
+    "version": "1.0.0",
+    "endpoints": {
+        "health": "/api/v1/health",
+        "health_database": "/api/v1/health/database",
+        "health_detailed": "/api/v1/health/detailed",
+        "metrics": "/api/v1/metrics",
+        "metrics_health": "/api/v1/metrics/health",
+        "auth_register": "/api/v1/auth/register",
+        "auth_login": "/api/v1/auth/login",
+        "auth_refresh": "/api/v1/auth/refresh",
+        "auth_logout": "/api/v1/auth/logout",
+        "auth_me": "/api/v1/auth/me",
+        "docs": "/docs"
+    }
+})
+
+
 # API v1 root endpoint
 @api_router.get("/")
 async def api_root():
     """API v1 root endpoint."""
-    return {
-        "message": "Defeah Marketing API v1",
-        "version": "1.0.0",
-        "endpoints": {
-            "health": "/api/v1/health",
-            "health_database": "/api/v1/health/database",
-            "health_detailed": "/api/v1/health/detailed",
-            "metrics": "/api/v1/metrics",
-            "metrics_health": "/api/v1/metrics/health",
-            "auth_register": "/api/v1/auth/register",
-            "auth_login": "/api/v1/auth/login",
-            "auth_refresh": "/api/v1/auth/refresh",
-            "auth_logout": "/api/v1/auth/logout",
-            "auth_me": "/api/v1/auth/me",
-            "docs": "/docs"
-        }
-    }
\ No newline at end of file
+    return Response(content=API_ROOT_RESPONSE, media_type="application/json")
@@ -1,21 +1,61 @@
 """
 Authentication utilities for password hashing and JWT token management.
 """
+import hashlib
+import hmac
 import logging
-from datetime import datetime, timedelta
+import secrets
+import string
+import time
+from uuid import uuid4
+from datetime import timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+from jose import ExpiredSignatureError, JWTError, jwk, jwt
 from app.core.config import settings
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt only uses the first 72 bytes of a password
+BCRYPT_MAX_PASSWORD_BYTES = 72
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+
+# Well-formed bcrypt hashes: "$2b$" + 2-digit cost + "$" + 53 chars of salt/digest
+BCRYPT_HASH_PREFIXES = ("$2a$", "$2b$", "$2y$")
+BCRYPT_HASH_LENGTH = 60
+
+# Character classes for password strength scoring
+_ASCII_LOWER = frozenset(string.ascii_lowercase)
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_ASCII_DIGITS = frozenset(string.digits)
+_ASCII_ALNUM = _ASCII_LOWER | _ASCII_UPPER | _ASCII_DIGITS
 
 # JWT configuration
 ALGORITHM = "HS256"
 
+# Secret encoded once and shared by JWT signing and the password cache HMAC
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode()
+
+# Signing key parsed once instead of on every encode/decode
+SIGNING_KEY = jwk.construct(_SECRET_KEY_BYTES, ALGORITHM)
+
+# Default token lifetimes in seconds
+ACCESS_TOKEN_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+REFRESH_TOKEN_EXPIRE_SECONDS = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+# Verified token cache (seconds)
+TOKEN_CACHE_ENABLED = settings.JWT_CACHE_ENABLED
+TOKEN_CACHE_TTL = 60
+NEGATIVE_TOKEN_CACHE_TTL = 5
+_token_cache = TTLCache(maxsize=50_000, ttl=TOKEN_CACHE_TTL)
+_CACHE_MISS = object()
+
+# Successful password verifications, keyed by (hash, HMAC of the password)
+PASSWORD_CACHE_TTL = 60
+_password_cache = TTLCache(maxsize=4096, ttl=PASSWORD_CACHE_TTL)
+
 
 def hash_password(password: str) -> str:
     """
@@ -27,13 +67,22 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode()[:BCRYPT_MAX_PASSWORD_BYTES],
+        bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
     
+    Successful verifications are cached briefly so repeated checks of the
+    same password skip the bcrypt key schedule. The plain password is only
+    kept as an HMAC keyed with SECRET_KEY, and failures are never cached.
+    Hashes that are not well-formed bcrypt strings are rejected without
+    running bcrypt.
+    
     Args:
         plain_password: Plain text password
         hashed_password: Stored hashed password
@@ -41,7 +90,46 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if not plain_password or not hashed_password:
+        return False
+    
+    if len(hashed_password) != BCRYPT_HASH_LENGTH or not hashed_password.startswith(BCRYPT_HASH_PREFIXES):
+        logger.warning("Malformed password hash")
+        return False
+    
+    key = (
+        hashed_password,
+        hmac.new(_SECRET_KEY_BYTES, plain_password.encode(), hashlib.sha256).digest()
+    )
+    if key in _password_cache:
+        return True
+    
+    try:
+        verified = bcrypt.checkpw(
+            plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES],
+            hashed_password.encode()
+        )
+    except ValueError:
+        logger.warning("Malformed password hash")
+        return False
+    
+    if verified:
+        _password_cache.set(key, True)
+    return verified
+
+
+@lru_cache(maxsize=1)
+def get_dummy_password_hash() -> str:
+    """
+    Get a bcrypt hash of a random secret for equalizing login timing.
+    
+    Verifying against this hash when a user does not exist makes failed
+    logins for unknown emails cost the same as for known ones.
+    
+    Returns:
+        Hashed password string that no user password will match
+    """
+    return hash_password(secrets.token_urlsafe(32))
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -57,13 +145,11 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS)
+    lifetime = expires_delta.total_seconds() if expires_delta else ACCESS_TOKEN_EXPIRE_SECONDS
+    expire = int(time.time() + lifetime)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, SIGNING_KEY, algorithm=ALGORITHM)
     
     logger.info("Created access token for user: %s", data.get("sub"))
     return encoded_jwt
@@ -82,13 +168,11 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    lifetime = expires_delta.total_seconds() if expires_delta else REFRESH_TOKEN_EXPIRE_SECONDS
+    expire = int(time.time() + lifetime)
     
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, SIGNING_KEY, algorithm=ALGORITHM)
     
     logger.info("Created refresh token for user: %s", data.get("sub"))
     return encoded_jwt
@@ -98,6 +182,11 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     """
     Verify and decode a JWT token.
     
+    Results are cached per token digest (raw tokens are never kept):
+    valid payloads until the earlier of the token's expiry and
+    TOKEN_CACHE_TTL, invalid tokens for a few seconds. Set
+    JWT_CACHE_ENABLED to False to decode on every call.
+    
     Args:
         token: JWT token string
         token_type: Type of token ("access" or "refresh")
@@ -105,8 +194,68 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     Returns:
         Decoded token payload or None if invalid
     """
+    if not token:
+        return None
+    
+    if not TOKEN_CACHE_ENABLED:
+        return _decode_token(token, token_type)
+    
+    key = _token_cache_key(token, token_type)
+    cached = _token_cache.get(key, _CACHE_MISS)
+    if cached is not _CACHE_MISS:
+        return dict(cached) if cached is not None else None
+    
+    payload = _decode_token(token, token_type)
+    
+    if payload is None:
+        _token_cache.set(key, None, ttl=NEGATIVE_TOKEN_CACHE_TTL)
+    else:
+        remaining = payload["exp"] - time.time()
+        _token_cache.set(key, payload, ttl=min(TOKEN_CACHE_TTL, remaining))
+        payload = dict(payload)
+    
+    return payload
+
+
+def invalidate_token(token: str) -> None:
+    """
+    Drop a token's cached verification result.
+    
+    Args:
+        token: JWT token string
+    """
+    for token_type in ("access", "refresh"):
+        _token_cache.pop(_token_cache_key(token, token_type))
+
+
+def get_token_id(token: str, payload: Dict[str, Any]) -> str:
+    """
+    Get the identifier used to blacklist a token.
+    
+    Tokens are identified by their ``jti`` claim. Tokens issued without one
+    fall back to a fixed-size digest, so the raw JWT is never sent to or
+    stored in Redis.
+    
+    Args:
+        token: JWT token string
+        payload: Decoded token payload
+        
+    Returns:
+        Token identifier
+    """
+    return payload.get("jti") or hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def _token_cache_key(token: str, token_type: str) -> Tuple[bytes, str]:
+    """Build the verified token cache key from a digest of the token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest(), token_type
+
+
+def _decode_token(token: str, token_type: str) -> Optional[Dict[str, Any]]:
+    """Decode and validate a JWT token without caching."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        # jose checks the signature and rejects expired tokens
+        payload = jwt.decode(token, SIGNING_KEY, algorithms=[ALGORITHM])
         
         # Check token type for refresh tokens
         if token_type == "refresh":
@@ -114,37 +263,50 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
                 logger.warning("Invalid token type: expected refresh, got %s", payload.get("type"))
                 return None
         
-        # Check expiration
-        exp = payload.get("exp")
-        if exp is None:
+        # Tokens without an expiry are never accepted
+        if "exp" not in payload:
             logger.warning("Token missing expiration claim")
             return None
         
-        if datetime.utcnow() > datetime.fromtimestamp(exp):
-            logger.warning("Token has expired")
-            return None
-        
         return payload
         
+    except ExpiredSignatureError:
+        logger.info("Token has expired")
+        return None
     except JWTError as e:
         logger.warning("JWT verification failed: %s", e)
         return None
 
 
-def get_password_strength_score(password: str) -> int:
+def _count_character_types(password: str) -> int:
     """
-    Calculate password strength score (0-100).
+    Count how many of lowercase, uppercase, digit and special characters occur.
     
-    Args:
-        password: Password to evaluate
-        
-    Returns:
-        Strength score from 0 (weak) to 100 (strong)
+    ASCII passwords are classified with set operations in a single C-level
+    pass; other passwords fall back to Unicode-aware str methods.
     """
+    if password.isascii():
+        chars = set(password)
+        return (
+            (not _ASCII_LOWER.isdisjoint(chars))
+            + (not _ASCII_UPPER.isdisjoint(chars))
+            + (not _ASCII_DIGITS.isdisjoint(chars))
+            + (not chars <= _ASCII_ALNUM)
+        )
+    
+    return sum((
+        any(c.islower() for c in password),
+        any(c.isupper() for c in password),
+        any(c.isdigit() for c in password),
+        any(not c.isalnum() for c in password),
+    ))
+
+
+def _score_password(length: int, char_types: int) -> int:
+    """Combine length and character variety into a 0-100 strength score."""
     score = 0
     
     # Length scoring
-    length = len(password)
     if length >= 8:
         score += 25
     if length >= 12:
@@ -153,17 +315,24 @@ def get_password_strength_score(password: str) -> int:
         score += 10
     
     # Character variety scoring
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_special = any(not c.isalnum() for c in password)
-    
-    char_variety = sum([has_lower, has_upper, has_digit, has_special])
-    score += char_variety * 12.5  # 50 points max for all 4 types
+    score += char_types * 12.5  # 50 points max for all 4 types
     
     return min(score, 100)
 
 
+def get_password_strength_score(password: str) -> int:
+    """
+    Calculate password strength score (0-100).
+    
+    Args:
+        password: Password to evaluate
+        
+    Returns:
+        Strength score from 0 (weak) to 100 (strong)
+    """
+    return _score_password(len(password), _count_character_types(password))
+
+
 def validate_password_strength(password: str) -> Tuple[bool, str]:
     """
     Validate password meets security requirements.
@@ -174,27 +343,27 @@ def validate_password_strength(password: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if len(password) < settings.PASSWORD_MIN_LENGTH:
+    length = len(password)
+    if length < settings.PASSWORD_MIN_LENGTH:
         return False, f"Password must be at least {settings.PASSWORD_MIN_LENGTH} characters long"
     
-    if len(password) > settings.PASSWORD_MAX_LENGTH:
+    if length > settings.PASSWORD_MAX_LENGTH:
         return False, f"Password must be less than {settings.PASSWORD_MAX_LENGTH} characters long"
     
     # Check for at least 3 of 4 character types
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_special = any(not c.isalnum() for c in password)
-    
-    char_types = sum([has_lower, has_upper, has_digit, has_special])
+    char_types = _count_character_types(password)
     if char_types < 3:
         return False, (
             "Password must contain at least 3 of the following: "
             "lowercase letters, uppercase letters, numbers, special characters"
         )
     
+    # Long passwords using all four character types score the maximum
+    if length >= 16 and char_types == 4:
+        return True, "Password meets security requirements"
+    
     # Check password strength score
-    strength_score = get_password_strength_score(password)
+    strength_score = _score_password(length, char_types)
     if strength_score < settings.PASSWORD_STRENGTH_THRESHOLD:
         return False, f"Password is too weak (score: {strength_score}/{settings.PASSWORD_STRENGTH_THRESHOLD}). Please choose a stronger password"
     
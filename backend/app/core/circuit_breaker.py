@@ -4,7 +4,7 @@ Circuit breaker pattern implementation for database health checks.
 import asyncio
 import time
 from enum import Enum
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Dict, Optional
 from functools import wraps
 import logging
 
@@ -29,8 +29,21 @@ class CircuitBreaker:
     
     The circuit breaker monitors failures and opens the circuit when
     failure threshold is exceeded, preventing cascading failures.
+    
+    Instances are only used from the event loop thread, and state is never
+    read and written across an ``await``, so counters and transitions need
+    no locking.
     """
     
+    # Fixed attribute layout: no per-instance __dict__, slot-offset access
+    __slots__ = (
+        "failure_threshold", "recovery_timeout", "expected_exception", "name",
+        "failure_count", "last_failure_monotonic", "last_failure_wallclock",
+        "state", "_trial_in_flight",
+        "total_calls", "successful_calls", "failed_calls", "circuit_opened_count",
+        "_stats",
+    )
+    
     def __init__(
         self,
         failure_threshold: int = 5,
@@ -54,8 +67,11 @@ class CircuitBreaker:
         
         # State tracking
         self.failure_count = 0
-        self.last_failure_time: Optional[float] = None
+        # Monotonic time drives recovery; wall clock is only kept for reporting
+        self.last_failure_monotonic: Optional[float] = None
+        self.last_failure_wallclock: Optional[float] = None
         self.state = CircuitState.CLOSED
+        self._trial_in_flight = False
         
         # Metrics
         self.total_calls = 0
@@ -63,16 +79,35 @@ class CircuitBreaker:
         self.failed_calls = 0
         self.circuit_opened_count = 0
         
+        # Stats snapshot, rebuilt only after the counters or state change
+        self._stats: Optional[dict] = None
+        
         logger.info(
             f"Initialized {self.name} with failure_threshold={failure_threshold}, "
             f"recovery_timeout={recovery_timeout}"
         )
     
     def __call__(self, func: Callable) -> Callable:
-        """Decorator to apply circuit breaker to a function."""
+        """
+        Decorator to apply circuit breaker to a function.
+        
+        The wrapper inlines call() so each wrapped call awaits a single
+        coroutine rather than going through a second one.
+        """
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            return await self.call(func, *args, **kwargs)
+            is_trial = self._admit()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                self._on_exception(e)
+                raise
+            finally:
+                if is_trial:
+                    self._trial_in_flight = False
+            
+            self._on_success()
+            return result
         
         return wrapper
     
@@ -92,46 +127,88 @@ class CircuitBreaker:
             CircuitBreakerError: When circuit is open
             Exception: Original function exceptions when circuit is closed
         """
-        self.total_calls += 1
-        
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-                logger.info(f"{self.name} transitioning to HALF_OPEN state")
-            else:
-                logger.warning(f"{self.name} circuit is OPEN, failing fast")
-                raise CircuitBreakerError(
-                    f"Circuit breaker {self.name} is OPEN. "
-                    f"Will retry after {self.recovery_timeout} seconds."
-                )
-        
+        is_trial = self._admit()
         try:
             result = await func(*args, **kwargs)
-            self._on_success()
-            return result
+        except Exception as e:
+            self._on_exception(e)
+            raise
+        finally:
+            if is_trial:
+                self._trial_in_flight = False
+        
+        self._on_success()
+        return result
+    
+    def _admit(self) -> bool:
+        """
+        Count a call and decide whether it may proceed.
+        
+        Returns:
+            True if the call is the half-open trial call
             
-        except self.expected_exception as e:
+        Raises:
+            CircuitBreakerError: When circuit is open
+        """
+        self.total_calls += 1
+        self._stats = None
+        
+        if self.state == CircuitState.OPEN and self._should_attempt_reset():
+            self._transition(CircuitState.HALF_OPEN)
+        
+        # Only a single trial call may probe a half-open circuit
+        if self.state == CircuitState.OPEN or (
+            self.state == CircuitState.HALF_OPEN and self._trial_in_flight
+        ):
+            logger.warning(f"{self.name} circuit is {self.state.name}, failing fast")
+            raise CircuitBreakerError(
+                f"Circuit breaker {self.name} is {self.state.name}. "
+                f"Will retry after {self.recovery_timeout} seconds."
+            )
+        
+        is_trial = self.state == CircuitState.HALF_OPEN
+        if is_trial:
+            self._trial_in_flight = True
+        return is_trial
+    
+    def _on_exception(self, exc: Exception) -> None:
+        """Record a failure for expected exceptions."""
+        if isinstance(exc, self.expected_exception):
             self._on_failure()
-            raise
-        except Exception as e:
+        else:
             # Unexpected exceptions don't count as failures
-            logger.error(f"{self.name} unexpected exception: {e}")
-            raise
+            logger.error(f"{self.name} unexpected exception: {exc}")
+    
+    def _transition(self, state: CircuitState) -> None:
+        """Move the circuit to a new state."""
+        self.state = state
+        self._stats = None
+        
+        if state == CircuitState.OPEN:
+            self.circuit_opened_count += 1
+            logger.error(
+                f"{self.name} circuit OPENED after {self.failure_count} failures. "
+                f"Will attempt recovery in {self.recovery_timeout} seconds."
+            )
+        elif state == CircuitState.HALF_OPEN:
+            logger.info(f"{self.name} transitioning to HALF_OPEN state")
+        else:
+            self.failure_count = 0
     
     def _should_attempt_reset(self) -> bool:
         """Check if circuit should attempt to reset."""
-        if self.last_failure_time is None:
+        if self.last_failure_monotonic is None:
             return True
         
-        return time.time() - self.last_failure_time >= self.recovery_timeout
+        return time.monotonic() - self.last_failure_monotonic >= self.recovery_timeout
     
     def _on_success(self):
         """Handle successful call."""
         self.successful_calls += 1
+        self._stats = None
         
         if self.state == CircuitState.HALF_OPEN:
-            self.state = CircuitState.CLOSED
-            self.failure_count = 0
+            self._transition(CircuitState.CLOSED)
             logger.info(f"{self.name} circuit CLOSED after successful recovery")
         elif self.state == CircuitState.CLOSED:
             # Reset failure count on success in closed state
@@ -140,17 +217,13 @@ class CircuitBreaker:
     def _on_failure(self):
         """Handle failed call."""
         self.failed_calls += 1
+        self._stats = None
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_monotonic = time.monotonic()
+        self.last_failure_wallclock = time.time()
         
-        if self.failure_count >= self.failure_threshold:
-            if self.state != CircuitState.OPEN:
-                self.state = CircuitState.OPEN
-                self.circuit_opened_count += 1
-                logger.error(
-                    f"{self.name} circuit OPENED after {self.failure_count} failures. "
-                    f"Will attempt recovery in {self.recovery_timeout} seconds."
-                )
+        if self.failure_count >= self.failure_threshold and self.state != CircuitState.OPEN:
+            self._transition(CircuitState.OPEN)
     
     @property
     def is_closed(self) -> bool:
@@ -168,13 +241,21 @@ class CircuitBreaker:
         return self.state == CircuitState.HALF_OPEN
     
     def get_stats(self) -> dict:
-        """Get circuit breaker statistics."""
+        """
+        Get circuit breaker statistics.
+        
+        The returned dict is shared between callers until the next call,
+        success, failure or reset, so it must not be modified.
+        """
+        if self._stats is not None:
+            return self._stats
+        
         success_rate = (
             (self.successful_calls / self.total_calls * 100) 
             if self.total_calls > 0 else 0
         )
         
-        return {
+        self._stats = {
             "name": self.name,
             "state": self.state.value,
             "total_calls": self.total_calls,
@@ -184,29 +265,52 @@ class CircuitBreaker:
             "failure_count": self.failure_count,
             "failure_threshold": self.failure_threshold,
             "circuit_opened_count": self.circuit_opened_count,
-            "last_failure_time": self.last_failure_time,
+            "last_failure_monotonic": self.last_failure_monotonic,
+            "last_failure_wallclock": self.last_failure_wallclock,
             "recovery_timeout": self.recovery_timeout,
         }
+        return self._stats
     
     def reset(self):
         """Manually reset circuit breaker to closed state."""
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.last_failure_time = None
+        self._transition(CircuitState.CLOSED)
+        self.last_failure_monotonic = None
+        self.last_failure_wallclock = None
         logger.info(f"{self.name} circuit manually reset to CLOSED state")
 
 
+# Circuit breakers by name, so each dependency (or shard) trips independently
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Get the circuit breaker registered under a name, creating it on first use.
+    
+    Args:
+        name: Circuit breaker name, e.g. one per database shard
+        **kwargs: CircuitBreaker settings, only applied when it is created
+        
+    Returns:
+        Circuit breaker for the name
+    """
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        breaker = _circuit_breakers[name] = CircuitBreaker(name=name, **kwargs)
+    return breaker
+
+
 # Global circuit breaker instances
-database_circuit_breaker = CircuitBreaker(
+database_circuit_breaker = get_circuit_breaker(
+    "DatabaseCircuitBreaker",
     failure_threshold=5,
     recovery_timeout=60,
-    expected_exception=Exception,
-    name="DatabaseCircuitBreaker"
+    expected_exception=Exception
 )
 
-health_check_circuit_breaker = CircuitBreaker(
+health_check_circuit_breaker = get_circuit_breaker(
+    "HealthCheckCircuitBreaker",
     failure_threshold=3,
     recovery_timeout=30,
-    expected_exception=Exception,
-    name="HealthCheckCircuitBreaker"
+    expected_exception=Exception
 )
\ No newline at end of file
@@ -2,18 +2,21 @@
 Database configuration and connection management with async support.
 Enhanced with timeout configuration, retry logic, and observability.
 """
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional, Tuple
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 import logging
 import asyncio
+import random
 import time
 from functools import wraps
+from uuid import uuid4
 
 from app.core.config import settings
+# Importing the models package registers every model on Base.metadata
+from app.models import Base
 from app.core.metrics import (
     track_db_query_metrics, 
     increment_db_connection_counter, 
@@ -26,6 +29,11 @@ logger = logging.getLogger(__name__)
 # Global engine variables
 async_engine = None
 sync_engine = None
+health_engine = None
+
+# Global session factories, bound to the engines above
+async_session_factory = None
+sync_session_factory = None
 
 
 def retry_with_exponential_backoff(max_attempts: int = None, base_delay: float = None):
@@ -50,18 +58,21 @@ def retry_with_exponential_backoff(max_attempts: int = None, base_delay: float =
                     track_retry_attempt(func.__name__, attempt + 1)
                     
                     if attempt == attempts - 1:  # Last attempt
-                        logger.error(f"Final attempt failed for {func.__name__}: {e}")
+                        logger.error("Final attempt failed for %s: %s", func.__name__, e)
                         raise
                     
-                    # Calculate delay with exponential backoff
+                    # Calculate delay with exponential backoff, jittered so
+                    # callers failing together don't all retry at once
+                    jitter = settings.DB_RETRY_JITTER
                     current_delay = min(
-                        delay * (settings.DB_RETRY_BACKOFF ** attempt),
+                        delay * (settings.DB_RETRY_BACKOFF ** attempt)
+                        * random.uniform(1 - jitter, 1 + jitter),
                         settings.DB_RETRY_MAX_DELAY
                     )
                     
                     logger.warning(
-                        f"Attempt {attempt + 1}/{attempts} failed for {func.__name__}: {e}. "
-                        f"Retrying in {current_delay:.2f} seconds..."
+                        "Attempt %d/%d failed for %s: %s. Retrying in %.2f seconds...",
+                        attempt + 1, attempts, func.__name__, e, current_delay
                     )
                     await asyncio.sleep(current_delay)
                     
@@ -69,102 +80,193 @@ def retry_with_exponential_backoff(max_attempts: int = None, base_delay: float =
     return decorator
 
 
+def _build_async_connect_args() -> dict:
+    """Build asyncpg connection arguments with timeouts."""
+    server_settings = {
+        "jit": "off",  # Disable JIT for faster connection
+    }
+    connect_args = {"server_settings": server_settings}
+    
+    # Add timeout configurations for asyncpg
+    if "asyncpg" in settings.DATABASE_URL_ASYNC:
+        connect_args["command_timeout"] = settings.DB_COMMAND_TIMEOUT
+        server_settings["statement_timeout"] = f"{settings.DB_COMMAND_TIMEOUT * 1000}ms"
+        
+        if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+            # Consecutive transactions may run on different server connections,
+            # so nothing prepared can be reused and names must never collide
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        else:
+            # Keep hot queries (like the per-request user lookup) prepared on
+            # the server instead of parsed and planned on every execution
+            connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+            connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    
+    return connect_args
+
+
+def _build_sync_connect_args() -> dict:
+    """Build psycopg2 connection arguments with timeouts."""
+    if "postgresql" in settings.DATABASE_URL and "asyncpg" not in settings.DATABASE_URL:
+        return {
+            "connect_timeout": settings.DB_CONNECT_TIMEOUT,
+            "options": f"-c statement_timeout={settings.DB_COMMAND_TIMEOUT * 1000}ms"
+        }
+    return {}
+
+
+# Connection arguments, built once from settings
+ASYNC_CONNECT_ARGS = _build_async_connect_args()
+SYNC_CONNECT_ARGS = _build_sync_connect_args()
+
+
+# Connections each worker's health check engine may hold
+HEALTH_POOL_CONNECTIONS = 2
+
+
+def get_pool_limits() -> Tuple[int, int]:
+    """
+    Get the async pool size and overflow for this worker process.
+    
+    Every worker gets an equal share of DB_MAX_CONNECTIONS, less its health
+    check connections. With DB_POOL_SIZE_AUTO the configured limits are
+    shrunk to fit that share; otherwise exceeding it only logs a warning.
+    
+    Returns:
+        Tuple of (pool_size, max_overflow)
+    """
+    workers = max(settings.WEB_CONCURRENCY, 1)
+    budget = max(settings.DB_MAX_CONNECTIONS // workers - HEALTH_POOL_CONNECTIONS, 1)
+    pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    
+    if pool_size + max_overflow <= budget:
+        return pool_size, max_overflow
+    
+    if settings.DB_POOL_SIZE_AUTO:
+        pool_size = min(pool_size, budget)
+        max_overflow = budget - pool_size
+        logger.info(
+            "Scaled database pool to pool_size=%d, max_overflow=%d for %d worker(s)",
+            pool_size, max_overflow, workers
+        )
+    else:
+        logger.warning(
+            "Database pool_size + max_overflow (%d) exceeds the %d connections "
+            "available per worker with %d worker(s)",
+            pool_size + max_overflow, budget, workers
+        )
+    return pool_size, max_overflow
+
+
 def get_async_engine():
     """Get or create async database engine with enhanced configuration."""
     global async_engine
     if async_engine is None:
-        # Prepare connection arguments with timeouts
-        connect_args = {
-            "server_settings": {
-                "jit": "off",  # Disable JIT for faster connection
-            }
-        }
-        
-        # Add timeout configurations for asyncpg
-        if "asyncpg" in settings.DATABASE_URL_ASYNC:
-            connect_args.update({
-                "command_timeout": settings.DB_COMMAND_TIMEOUT,
-                "server_settings": {
-                    **connect_args.get("server_settings", {}),
-                    "statement_timeout": f"{settings.DB_COMMAND_TIMEOUT * 1000}ms",
-                }
-            })
-        
+        pool_size, max_overflow = get_pool_limits()
         async_engine = create_async_engine(
             settings.DATABASE_URL_ASYNC,
             echo=settings.DEBUG,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             pool_pre_ping=settings.DB_POOL_PRE_PING,
             pool_recycle=settings.DB_POOL_RECYCLE,
             poolclass=StaticPool if "test" in settings.DATABASE_URL_ASYNC else None,
-            connect_args=connect_args,
+            connect_args=ASYNC_CONNECT_ARGS,
             # Connection timeout
             pool_timeout=settings.DB_CONNECT_TIMEOUT,
         )
-        logger.info(f"Created async database engine with pool_size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}")
+        logger.info(
+            "Created async database engine with pool_size=%d, max_overflow=%d, "
+            "statement_cache_size=%s (PgBouncer transaction mode: %s)",
+            pool_size, max_overflow,
+            ASYNC_CONNECT_ARGS.get("prepared_statement_cache_size", "default"),
+            settings.DB_PGBOUNCER_TRANSACTION_MODE
+        )
         increment_db_connection_counter("async", "created")
     return async_engine
 
 
+def get_health_engine():
+    """
+    Get or create the async engine used only for health checks.
+    
+    Health probes get their own single-connection pool so they still answer
+    (or fail for real connectivity reasons) when the application pool is
+    fully checked out. Probes are read-only, so the engine runs in
+    autocommit mode and skips the BEGIN/ROLLBACK around each query.
+    """
+    global health_engine
+    if health_engine is None:
+        health_engine = create_async_engine(
+            settings.DATABASE_URL_ASYNC,
+            pool_size=1,
+            max_overflow=HEALTH_POOL_CONNECTIONS - 1,
+            pool_pre_ping=False,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            connect_args=ASYNC_CONNECT_ARGS,
+            pool_timeout=settings.DB_CONNECT_TIMEOUT,
+            isolation_level="AUTOCOMMIT",
+        )
+        logger.info("Created health check database engine")
+        increment_db_connection_counter("health", "created")
+    return health_engine
+
+
 def get_sync_engine():
-    """Get or create sync database engine with enhanced configuration."""
+    """
+    Get or create sync database engine.
+    
+    The sync engine only serves migrations and administrative scripts, so it
+    uses NullPool: connections are opened per use and closed afterwards
+    instead of holding idle server backends next to the async pool.
+    """
     global sync_engine
     if sync_engine is None:
-        # Prepare connection arguments with timeouts
-        connect_args = {}
-        
-        # Add timeout configurations for psycopg2
-        if "postgresql" in settings.DATABASE_URL and "asyncpg" not in settings.DATABASE_URL:
-            connect_args.update({
-                "connect_timeout": settings.DB_CONNECT_TIMEOUT,
-                "options": f"-c statement_timeout={settings.DB_COMMAND_TIMEOUT * 1000}ms"
-            })
-        
         sync_engine = create_engine(
             settings.DATABASE_URL,
             echo=settings.DEBUG,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_MAX_OVERFLOW,
+            poolclass=NullPool,
             pool_pre_ping=settings.DB_POOL_PRE_PING,
             pool_recycle=settings.DB_POOL_RECYCLE,
-            connect_args=connect_args,
-            pool_timeout=settings.DB_CONNECT_TIMEOUT,
+            connect_args=SYNC_CONNECT_ARGS,
         )
-        logger.info(f"Created sync database engine with pool_size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}")
+        logger.info("Created sync database engine without connection pooling")
         increment_db_connection_counter("sync", "created")
     return sync_engine
 
 # Session factory functions
 def get_async_session_factory():
-    """Get async session factory."""
-    return async_sessionmaker(
-        bind=get_async_engine(),
-        class_=AsyncSession,
-        autocommit=False,
-        autoflush=False,
-        expire_on_commit=False,
-    )
+    """Get or create async session factory."""
+    global async_session_factory
+    if async_session_factory is None:
+        async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return async_session_factory
 
 
 def get_sync_session_factory():
-    """Get sync session factory."""
-    return sessionmaker(autocommit=False, autoflush=False, bind=get_sync_engine())
-
-# Create base class for models
-Base = declarative_base()
+    """Get or create sync session factory."""
+    global sync_session_factory
+    if sync_session_factory is None:
+        sync_session_factory = sessionmaker(autocommit=False, autoflush=False, bind=get_sync_engine())
+    return sync_session_factory
 
 
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get async database session with retry logic."""
-    async_session_factory = get_async_session_factory()
-    
-    @retry_with_exponential_backoff(max_attempts=2, base_delay=0.5)  # Quick retry for sessions
-    async def get_session():
-        return async_session_factory()
+    """Dependency to get async database session."""
+    session_factory = get_async_session_factory()
     
     try:
-        session = await get_session()
+        # Creating a session is synchronous and doesn't connect yet, so
+        # there is nothing transient to retry here
+        session = session_factory()
         async with session:
             try:
                 yield session
@@ -176,44 +278,47 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
             finally:
                 await session.close()
     except Exception as e:
-        logger.error(f"Failed to create database session after retries: {e}")
+        logger.error(f"Failed to create database session: {e}")
         raise
 
 
+async def get_health_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an async session on the health check engine."""
+    async with AsyncSession(bind=get_health_engine(), expire_on_commit=False) as session:
+        yield session
+
+
 def get_db():
     """Dependency to get sync database session (for migrations)."""
-    sync_session_factory = get_sync_session_factory()
-    db = sync_session_factory()
+    session_factory = get_sync_session_factory()
+    db = session_factory()
     try:
         yield db
     finally:
         db.close()
 
 
-@retry_with_exponential_backoff()
 @track_db_query_metrics("create_tables")
+@retry_with_exponential_backoff()
 async def create_tables():
     """Create all database tables asynchronously with retry logic."""
-    # Import models to ensure they are registered with Base
-    from app.models.user import User  # noqa: F401
-    
     engine = get_async_engine()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created/verified successfully")
 
 
-@retry_with_exponential_backoff()
 @track_db_query_metrics("health_check")
+@retry_with_exponential_backoff()
 async def check_database_connection() -> bool:
     """Check if database connection is healthy with retry logic."""
     try:
-        engine = get_async_engine()
-        start_time = time.time()
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
+        engine = get_health_engine()
+        start_time = time.perf_counter()
+        async with engine.connect() as conn:
+            await conn.scalar(text("SELECT 1"))
         
-        response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+        response_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
         logger.info(f"Database connection is healthy (response time: {response_time:.2f}ms)")
         return True
     except Exception as e:
@@ -223,14 +328,19 @@ async def check_database_connection() -> bool:
 
 async def close_database_connections():
     """Close all database connections gracefully."""
-    global async_engine, sync_engine
+    global async_engine, sync_engine, health_engine, async_session_factory, sync_session_factory
+    # Factories are bound to the engines being disposed
+    async_session_factory = None
+    sync_session_factory = None
+    engines = (async_engine, health_engine, sync_engine)
+    async_engine = health_engine = sync_engine = None
     try:
-        if async_engine:
-            await async_engine.dispose()
-            async_engine = None
-        if sync_engine:
-            sync_engine.dispose()
-            sync_engine = None
+        # Dispose all pools concurrently; the sync pool closes in a worker
+        # thread so its socket teardown doesn't block the event loop
+        disposals = [engine.dispose() for engine in engines[:2] if engine is not None]
+        if engines[2] is not None:
+            disposals.append(asyncio.to_thread(engines[2].dispose))
+        await asyncio.gather(*disposals)
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
\ No newline at end of file
@@ -1,15 +1,18 @@
 """
 Authentication dependencies for FastAPI.
 """
+import asyncio
 import logging
-from typing import Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Dict, Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_async_db
 from app.core.auth import verify_token
 from app.core.redis_client import token_blacklist
+from app.core.user_cache import cache_user, get_cached_user
 from app.models.user import User
 from app.schemas.auth import TokenPayload
 from app.utils.exceptions import (
@@ -19,28 +22,96 @@ from app.utils.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+
+class BearerToken(HTTPBearer):
+    """
+    HTTP Bearer scheme that resolves to the raw token string.
+    
+    Subclassing HTTPBearer keeps the scheme in the OpenAPI docs, while the
+    lookup itself is a single prefix check with no credentials model built.
+    """
+    
+    async def __call__(self, request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if not authorization or authorization[:7].lower() != "bearer ":
+            return None
+        return authorization[7:].strip() or None
+
+
 # HTTP Bearer token security scheme
-security = HTTPBearer(auto_error=False)
+bearer_token = BearerToken(auto_error=False)
+
+# In-flight user loads by user ID; each resolves to True if the user was
+# found active (and cached), False if not, or None if the load failed
+_user_loads: Dict[str, "asyncio.Future[Optional[bool]]"] = {}
+
+
+async def _get_active_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    Get an active user, from the in-process user cache when possible.
+    
+    Cached users are merged into the request's session without a SELECT, so
+    handlers can modify and commit them like freshly loaded rows. Concurrent
+    cache misses for the same user wait for a single database load.
+    
+    Args:
+        db: Database session
+        user_id: User ID from the token subject
+        
+    Returns:
+        Session-bound user object, or None if not found or inactive
+    """
+    cached = get_cached_user(user_id)
+    if cached is None and user_id in _user_loads:
+        # Shielded so a cancelled waiter doesn't cancel the shared future
+        found = await asyncio.shield(_user_loads[user_id])
+        if found is False:
+            return None
+        cached = get_cached_user(user_id)
+    
+    if cached is not None:
+        return await db.merge(cached, load=False)
+    
+    return await _load_active_user(db, user_id)
+
+
+async def _load_active_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """Load and cache an active user, publishing the outcome to waiting requests."""
+    future = asyncio.get_running_loop().create_future()
+    is_owner = _user_loads.setdefault(user_id, future) is future
+    found = None
+    try:
+        # Primary key lookup: checks the session identity map before querying
+        user = await db.get(User, UUID(user_id))
+        found = user is not None and user.is_active
+        if not found:
+            return None
+        
+        cache_user(user)
+        return user
+    finally:
+        if is_owner:
+            del _user_loads[user_id]
+            future.set_result(found)
 
 
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    token: Optional[str] = Depends(bearer_token),
     db: AsyncSession = Depends(get_async_db)
 ) -> Optional[User]:
     """
     Get current user from JWT token (optional - returns None if no token or invalid).
     
     Args:
-        credentials: HTTP authorization credentials
+        token: Bearer token from the Authorization header
         db: Database session
         
     Returns:
         User object if authenticated, None otherwise
     """
-    if not credentials:
+    if not token:
         return None
     
-    token = credentials.credentials
     payload = verify_token(token, token_type="access")
     
     if not payload:
@@ -51,12 +122,9 @@ async def get_current_user_optional(
         if not user_id:
             return None
         
-        # Get user from database
-        stmt = select(User).where(User.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        user = await _get_active_user(db, user_id)
         
-        if not user or not user.is_active:
+        if not user:
             return None
         
         return user
@@ -67,14 +135,14 @@ async def get_current_user_optional(
 
 
 async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    token: Optional[str] = Depends(bearer_token),
     db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Get current user from JWT token (required - raises exception if invalid).
     
     Args:
-        credentials: HTTP authorization credentials
+        token: Bearer token from the Authorization header
         db: Database session
         
     Returns:
@@ -83,19 +151,26 @@ async def get_current_user(
     Raises:
         HTTPException: If authentication fails
     """
-    if not credentials:
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    token = credentials.credentials
+    # Verify token
+    payload = verify_token(token, token_type="access")
+    
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     # Check if token is blacklisted
     try:
-        is_blacklisted = await token_blacklist.is_blacklisted(token)
-        if is_blacklisted:
+        if await token_blacklist.is_token_revoked(token, payload):
             raise TokenBlacklistedError()
     except TokenBlacklistedError:
         raise HTTPException(
@@ -107,16 +182,6 @@ async def get_current_user(
         logger.warning("Error checking token blacklist: %s", e)
         # Continue with validation if Redis is down
     
-    # Verify token
-    payload = verify_token(token, token_type="access")
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
     try:
         user_id = payload.get("sub")
         if not user_id:
@@ -126,22 +191,12 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Get user from database
-        stmt = select(User).where(User.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        user = await _get_active_user(db, user_id)
         
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User account is inactive",
+                detail="User not found or inactive",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
@@ -163,23 +218,17 @@ async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
     """
-    Get current active user (additional check for active status).
+    Get current active user.
+    
+    get_current_user only loads active users, so this is a pass-through kept
+    for endpoints that declare the dependency explicitly.
     
     Args:
         current_user: Current user from get_current_user dependency
         
     Returns:
         Active user object
-        
-    Raises:
-        HTTPException: If user is not active
     """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User account is inactive"
-        )
-    
     return current_user
 
 
@@ -208,13 +257,13 @@ async def get_current_verified_user(
 
 
 def verify_refresh_token(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    token: Optional[str] = Depends(bearer_token)
 ) -> TokenPayload:
     """
     Verify refresh token and return payload.
     
     Args:
-        credentials: HTTP authorization credentials
+        token: Bearer token from the Authorization header
         
     Returns:
         Token payload
@@ -222,14 +271,13 @@ def verify_refresh_token(
     Raises:
         HTTPException: If refresh token is invalid
     """
-    if not credentials:
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token required",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    token = credentials.credentials
     payload = verify_token(token, token_type="refresh")
     
     if not payload:
@@ -239,7 +287,7 @@ def verify_refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return TokenPayload(**payload)
+    return TokenPayload.model_validate(payload)
 
 
 async def get_user_by_email(
@@ -257,7 +305,7 @@ async def get_user_by_email(
         User object if found, None otherwise
     """
     try:
-        stmt = select(User).where(User.email == email.lower().strip())
+        stmt = select(User).where(User.email == email.lower().strip()).limit(1)
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
     except Exception as e:
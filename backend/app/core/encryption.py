@@ -0,0 +1,75 @@
+"""
+Authenticated encryption for third-party credentials stored in the database.
+"""
+import base64
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCMSIV
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# AES-GCM-SIV nonce size in bytes
+NONCE_SIZE = 12
+
+
+@lru_cache(maxsize=1)
+def get_cipher() -> AESGCMSIV:
+    """
+    Get the AES-256-GCM-SIV cipher for the configured key.
+
+    The key format is checked when settings load; it is only required once
+    a secret is actually encrypted or decrypted.
+
+    Returns:
+        AEAD cipher instance
+
+    Raises:
+        RuntimeError: If TOKEN_ENCRYPTION_KEY is not configured
+    """
+    if not settings.TOKEN_ENCRYPTION_KEY:
+        raise RuntimeError("TOKEN_ENCRYPTION_KEY must be set to store encrypted credentials")
+    return AESGCMSIV(base64.b64decode(settings.TOKEN_ENCRYPTION_KEY))
+
+
+def encrypt_secret(plaintext: str, associated_data: str) -> str:
+    """
+    Encrypt a secret for storage.
+
+    Args:
+        plaintext: Secret to encrypt (e.g. an Instagram access token)
+        associated_data: Context the ciphertext is bound to (e.g. the user ID)
+
+    Returns:
+        Base64-encoded nonce and ciphertext
+    """
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = get_cipher().encrypt(nonce, plaintext.encode(), associated_data.encode())
+    return base64.b64encode(nonce + ciphertext).decode()
+
+
+def decrypt_secret(encrypted: str, associated_data: str) -> Optional[str]:
+    """
+    Decrypt a secret produced by ``encrypt_secret``.
+
+    Args:
+        encrypted: Base64-encoded nonce and ciphertext
+        associated_data: Context the ciphertext was bound to
+
+    Returns:
+        Decrypted secret, or None if it was tampered with or bound to another context
+    """
+    try:
+        raw = base64.b64decode(encrypted)
+        plaintext = get_cipher().decrypt(
+            raw[:NONCE_SIZE], raw[NONCE_SIZE:], associated_data.encode()
+        )
+        return plaintext.decode()
+    except (InvalidTag, ValueError) as e:
+        logger.warning("Failed to decrypt stored secret: %s", type(e).__name__)
+        return None
@@ -0,0 +1,93 @@
+"""
+Executor for CPU-bound password hashing off the asyncio event loop.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from app.core.auth import get_dummy_password_hash, hash_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+# Global thread pool (created lazily on first use). bcrypt releases the GIL
+# while hashing, so threads run in parallel without process start-up or
+# pickling costs, and share the in-process verification cache.
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_hash_pool() -> ThreadPoolExecutor:
+    """Get or create the password hashing thread pool."""
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+        logger.info("Created password hashing pool with %s workers", os.cpu_count())
+    return _pool
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password with bcrypt without blocking the event loop.
+
+    Args:
+        password: Plain text password to hash
+
+    Returns:
+        Hashed password string
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_pool(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Stored hashed password
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_hash_pool(), verify_password, plain_password, hashed_password
+    )
+
+
+async def warm_dummy_password_hash() -> None:
+    """
+    Compute the login timing-equalization hash in the hashing pool.
+
+    Called at startup so the first login for an unknown email doesn't run
+    bcrypt on the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_hash_pool(), get_dummy_password_hash)
+
+
+def hash_passwords_bulk(passwords: Iterable[str]) -> List[str]:
+    """
+    Hash many passwords in parallel across the hashing pool.
+
+    Intended for imports, migrations and seeding; request handlers should
+    use hash_password_async.
+
+    Args:
+        passwords: Plain text passwords to hash
+
+    Returns:
+        Hashed password strings in input order
+    """
+    return list(get_hash_pool().map(hash_password, passwords))
+
+
+def shutdown_hash_pool() -> None:
+    """Shut down the password hashing pool."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        logger.info("Password hashing pool shut down")
@@ -1,9 +1,14 @@
 """
 Prometheus metrics for database and application monitoring.
+
+Metrics live in process memory. When PROMETHEUS_MULTIPROC_DIR is set,
+prometheus_client backs them with per-worker files instead, which the
+metrics endpoint merges at scrape time; gauges then report the sum over
+live workers.
 """
 import time
-from functools import wraps
-from typing import Callable, Any
+from functools import lru_cache, wraps
+from typing import Callable, Any, Dict, Tuple
 import logging
 from prometheus_client import Counter, Histogram, Gauge, Info
 
@@ -19,19 +24,22 @@ db_connections_total = Counter(
 db_connection_pool_size = Gauge(
     'db_connection_pool_size',
     'Current size of database connection pool',
-    ['engine_type']
+    ['engine_type'],
+    multiprocess_mode='livesum'
 )
 
 db_connection_pool_checked_out = Gauge(
     'db_connection_pool_checked_out',
     'Number of connections currently checked out from pool',
-    ['engine_type']
+    ['engine_type'],
+    multiprocess_mode='livesum'
 )
 
 db_connection_pool_checked_in = Gauge(
     'db_connection_pool_checked_in',
     'Number of connections currently checked in to pool',
-    ['engine_type']
+    ['engine_type'],
+    multiprocess_mode='livesum'
 )
 
 # Database Query Metrics
@@ -80,7 +88,8 @@ app_request_duration_seconds = Histogram(
 db_sessions_active = Gauge(
     'db_sessions_active',
     'Number of active database sessions',
-    ['session_type']
+    ['session_type'],
+    multiprocess_mode='livesum'
 )
 
 db_session_errors_total = Counter(
@@ -110,6 +119,27 @@ app_info.info({
 })
 
 
+def _label_children(histogram: Histogram, counter: Counter, **labels) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Get the histogram and counter children for each call status.
+
+    Args:
+        histogram: Duration histogram labelled by status and ``labels``
+        counter: Call counter labelled by status and ``labels``
+        **labels: Label values other than status
+
+    Returns:
+        Mapping of status to (histogram child, counter child)
+    """
+    return {
+        status: (
+            histogram.labels(status=status, **labels),
+            counter.labels(status=status, **labels),
+        )
+        for status in ('success', 'error')
+    }
+
+
 def track_db_query_metrics(operation: str):
     """
     Decorator to track database query metrics.
@@ -117,32 +147,29 @@ def track_db_query_metrics(operation: str):
     Args:
         operation: Name of the database operation (e.g., 'select', 'insert', 'health_check')
     """
+    # Resolve the labelled children once instead of on every call
+    children = _label_children(db_query_duration_seconds, db_queries_total, operation=operation)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            start_time = time.time()
+            start_time = time.perf_counter()
             status = 'success'
 
             try:
                 result = await func(*args, **kwargs)
                 return result
-            except Exception as e:
+            except Exception:
+                # Failures are recorded by the error label; callers log them
                 status = 'error'
-                logger.error("Database operation %s failed: %s", operation, e)
                 raise
             finally:
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
 
                 # Update metrics
-                db_query_duration_seconds.labels(
-                    operation=operation,
-                    status=status
-                ).observe(duration)
-
-                db_queries_total.labels(
-                    operation=operation,
-                    status=status
-                ).inc()
+                histogram, counter = children[status]
+                histogram.observe(duration)
+                counter.inc()
 
         return wrapper
     return decorator
@@ -155,10 +182,13 @@ def track_health_check_metrics(check_type: str):
     Args:
         check_type: Type of health check (e.g., 'basic', 'database', 'detailed')
     """
+    # Resolve the labelled children once instead of on every call
+    children = _label_children(health_check_duration_seconds, health_checks_total, check_type=check_type)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            start_time = time.time()
+            start_time = time.perf_counter()
             status = 'success'
 
             try:
@@ -169,87 +199,69 @@ def track_health_check_metrics(check_type: str):
                 logger.error("Health check %s failed: %s", check_type, e)
                 raise
             finally:
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
 
                 # Update metrics
-                health_check_duration_seconds.labels(
-                    check_type=check_type,
-                    status=status
-                ).observe(duration)
-
-                health_checks_total.labels(
-                    check_type=check_type,
-                    status=status
-                ).inc()
+                histogram, counter = children[status]
+                histogram.observe(duration)
+                counter.inc()
 
         return wrapper
     return decorator
 
 
-def update_connection_pool_metrics():
-    """Update connection pool metrics from current engine state."""
-    try:
-        from app.core.database import get_async_engine, get_sync_engine
+# Monotonic time of the last connection pool metrics refresh
+_pool_metrics_updated_at = float("-inf")
 
-        # Update async engine metrics
-        try:
-            async_engine = get_async_engine()
-            if async_engine and hasattr(async_engine, 'pool'):
-                pool = async_engine.pool
 
-                if hasattr(pool, 'size'):
-                    db_connection_pool_size.labels(engine_type='async').set(pool.size())
-
-                if hasattr(pool, 'checkedout'):
-                    db_connection_pool_checked_out.labels(engine_type='async').set(pool.checkedout())
-
-                if hasattr(pool, 'checkedin'):
-                    db_connection_pool_checked_in.labels(engine_type='async').set(pool.checkedin())
-
-        except Exception as e:
-            logger.warning("Failed to update async engine metrics: %s", e)
-
-        # Update sync engine metrics
+def update_connection_pool_metrics(max_age: float = 0.0):
+    """
+    Update connection pool metrics from current engine state.
+    
+    Args:
+        max_age: Skip the refresh if the gauges were updated less than this
+            many seconds ago
+    """
+    global _pool_metrics_updated_at
+    
+    now = time.monotonic()
+    if now - _pool_metrics_updated_at < max_age:
+        return
+    _pool_metrics_updated_at = now
+    
+    # Read the engines without the get_*_engine() helpers, which would create
+    # an engine (and its pool) just to report on it
+    from app.core import database
+
+    for engine_type, engine in (("async", database.async_engine), ("sync", database.sync_engine)):
+        # Only queue pools report sizes (not NullPool/StaticPool)
+        pool = engine.pool if engine is not None else None
+        if not hasattr(pool, 'size'):
+            continue
         try:
-            sync_engine = get_sync_engine()
-            if sync_engine and hasattr(sync_engine, 'pool'):
-                pool = sync_engine.pool
-
-                if hasattr(pool, 'size'):
-                    db_connection_pool_size.labels(engine_type='sync').set(pool.size())
-
-                if hasattr(pool, 'checkedout'):
-                    db_connection_pool_checked_out.labels(engine_type='sync').set(pool.checkedout())
-
-                if hasattr(pool, 'checkedin'):
-                    db_connection_pool_checked_in.labels(engine_type='sync').set(pool.checkedin())
-
+            _labelled(db_connection_pool_size, engine_type).set(pool.size())
+            _labelled(db_connection_pool_checked_out, engine_type).set(pool.checkedout())
+            _labelled(db_connection_pool_checked_in, engine_type).set(pool.checkedin())
         except Exception as e:
-            logger.warning("Failed to update sync engine metrics: %s", e)
+            logger.warning("Failed to update %s engine metrics: %s", engine_type, e)
+
 
-    except Exception as e:
-        logger.error("Failed to update connection pool metrics: %s", e)
+@lru_cache(maxsize=None)
+def _labelled(metric, *label_values: str):
+    """Get a metric's child for the given label values, resolved once per combination."""
+    return metric.labels(*label_values)
 
 
 def track_retry_attempt(operation: str, attempt_number: int):
     """Track database retry attempts."""
-    db_retry_attempts_total.labels(
-        operation=operation,
-        attempt_number=str(attempt_number)
-    ).inc()
+    _labelled(db_retry_attempts_total, operation, str(attempt_number)).inc()
 
 
 def increment_db_connection_counter(engine_type: str, status: str):
     """Increment database connection counter."""
-    db_connections_total.labels(
-        engine_type=engine_type,
-        status=status
-    ).inc()
+    _labelled(db_connections_total, engine_type, status).inc()
 
 
 def track_session_error(error_type: str, session_type: str):
     """Track database session errors."""
-    db_session_errors_total.labels(
-        error_type=error_type,
-        session_type=session_type
-    ).inc()
\ No newline at end of file
+    _labelled(db_session_errors_total, error_type, session_type).inc()
\ No newline at end of file
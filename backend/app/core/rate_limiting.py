@@ -1,8 +1,12 @@
 """
 Rate limiting middleware for authentication endpoints.
 """
+import hashlib
 import logging
-from typing import Callable, Optional
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from app.core.redis_client import rate_limiter
@@ -12,30 +16,52 @@ from app.utils.exceptions import RateLimitError
 logger = logging.getLogger(__name__)
 
 
+# Request scope key caching the client identifier for the request
+_CLIENT_ID_SCOPE_KEY = "client_identifier"
+
+# Reverse proxies in front of the app that append to X-Forwarded-For
+TRUSTED_PROXY_DEPTH = settings.TRUSTED_PROXY_DEPTH
+
+
 def get_client_identifier(request: Request) -> str:
     """
     Get client identifier for rate limiting.
     
+    The result is cached in the request scope, so the rate limit middleware
+    and endpoint checks parse the headers once per request.
+    
     Args:
         request: FastAPI request object
         
     Returns:
         Client identifier string
     """
+    client_ip = request.scope.get(_CLIENT_ID_SCOPE_KEY)
+    if client_ip is not None:
+        return client_ip
+    
     # Try to get real IP from headers (for reverse proxy setups)
     forwarded_for = request.headers.get("X-Forwarded-For")
-    if forwarded_for:
-        # Take the first IP in the chain
-        client_ip = forwarded_for.split(",")[0].strip()
-    else:
+    if not forwarded_for:
         client_ip = request.client.host if request.client else "unknown"
+    elif TRUSTED_PROXY_DEPTH > 0:
+        # Each trusted proxy appended the address it received the request
+        # from, so the entry that many hops from the end was not client-set
+        hops = forwarded_for.rsplit(",", TRUSTED_PROXY_DEPTH)
+        client_ip = hops[-TRUSTED_PROXY_DEPTH if len(hops) > TRUSTED_PROXY_DEPTH else 0].strip()
+    else:
+        # Take the first IP in the chain
+        client_ip = forwarded_for.partition(",")[0].strip()
     
+    request.scope[_CLIENT_ID_SCOPE_KEY] = client_ip
     return client_ip
 
 
 class RateLimitMiddleware:
     """Rate limiting middleware for specific endpoints."""
     
+    __slots__ = ("calls", "period", "identifier_func")
+    
     def __init__(self, calls: int, period: int, identifier_func: Callable = None):
         """
         Initialize rate limiter.
@@ -72,8 +98,8 @@ class RateLimitMiddleware:
             
             if is_limited:
                 logger.warning(
-                    "Rate limit exceeded for %s on %s: %d/%d requests",
-                    identifier, endpoint, info.get("current_count", 0), self.calls
+                    "Rate limit exceeded for %s on %s: %d requests per %ds",
+                    identifier, endpoint, self.calls, self.period
                 )
                 
                 headers = {
@@ -116,6 +142,80 @@ class RateLimitMiddleware:
             return None
 
 
+class LocalRateLimiter:
+    """
+    In-process token bucket rate limiter.
+    
+    Used for authenticated traffic, where the caller is already identified by
+    user ID and a per-worker limit is enough, so no Redis round trip is needed.
+    Buckets are kept in an LRU so memory stays bounded.
+    """
+    
+    def __init__(self, maxsize: int = 10_000):
+        """
+        Initialize local rate limiter.
+        
+        Args:
+            maxsize: Maximum number of buckets kept
+        """
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
+    def is_rate_limited(
+        self,
+        identifier: str,
+        limit: int,
+        window: int,
+        action: str = "request"
+    ) -> Tuple[bool, Dict]:
+        """
+        Check if identifier is rate limited.
+        
+        Args:
+            identifier: Unique identifier (user ID)
+            limit: Maximum burst of requests allowed
+            window: Seconds to refill a full bucket
+            action: Action type
+            
+        Returns:
+            Tuple of (is_limited, info_dict)
+        """
+        key = f"{action}:{identifier}"
+        now = time.monotonic()
+        rate = limit / window
+        
+        tokens, updated_at = self._buckets.pop(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - updated_at) * rate)
+        
+        limited = tokens < 1
+        if not limited:
+            tokens -= 1
+        
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        
+        if limited:
+            retry_after = math.ceil((1 - tokens) / rate)
+            return True, {
+                "limited": True,
+                "limit": limit,
+                "reset_time": retry_after,
+                "retry_after": retry_after
+            }
+        
+        return False, {
+            "limited": False,
+            "limit": limit,
+            "remaining": int(tokens),
+            "reset_time": window
+        }
+
+
+# In-process limiter for authenticated endpoints
+local_rate_limiter = LocalRateLimiter()
+
+
 # Pre-configured rate limiters for different endpoints
 login_rate_limiter = RateLimitMiddleware(
     calls=settings.LOGIN_RATE_LIMIT,
@@ -133,6 +233,20 @@ general_rate_limiter = RateLimitMiddleware(
 )
 
 
+# (limit, window) per action, read once from the frozen settings
+_GENERAL_LIMIT = (settings.GENERAL_RATE_LIMIT, settings.GENERAL_RATE_WINDOW)
+_AUTH_ACTION_LIMITS: Dict[str, Tuple[int, int]] = {
+    "login": (settings.LOGIN_RATE_LIMIT, settings.LOGIN_RATE_WINDOW),
+    "registration": (settings.REGISTRATION_RATE_LIMIT, settings.REGISTRATION_RATE_WINDOW),
+}
+_ACCOUNT_ACTION_LIMITS: Dict[str, Tuple[int, int]] = {
+    "login": (settings.LOGIN_ACCOUNT_RATE_LIMIT, settings.LOGIN_ACCOUNT_RATE_WINDOW),
+}
+_USER_ACTION_LIMITS: Dict[str, Tuple[int, int]] = {
+    "change_password": (settings.LOGIN_RATE_LIMIT, settings.LOGIN_RATE_WINDOW),
+}
+
+
 def rate_limit(calls: int, period: int, identifier_func: Callable = None):
     """
     Decorator for applying rate limiting to FastAPI endpoints.
@@ -181,13 +295,24 @@ def rate_limit(calls: int, period: int, identifier_func: Callable = None):
     return decorator
 
 
-async def check_authentication_rate_limit(request: Request, action: str) -> bool:
+async def check_authentication_rate_limit(
+    request: Request,
+    action: str,
+    account: Optional[str] = None
+) -> bool:
     """
     Check rate limit for authentication actions.
     
+    Attempts are limited per client IP and, for actions with an account
+    limit, also per targeted account across all IPs, which throttles
+    guessing spread over many addresses. The account bucket is large and
+    refills quickly, so draining it only delays the real user by seconds
+    rather than locking them out. Both scopes are checked in one round trip.
+    
     Args:
         request: FastAPI request object
         action: Action type ("login", "registration", etc.)
+        account: Account the attempt targets (e.g. the login email)
         
     Returns:
         True if allowed, False if rate limited
@@ -196,31 +321,24 @@ async def check_authentication_rate_limit(request: Request, action: str) -> bool
         RateLimitError: If rate limit exceeded
     """
     identifier = get_client_identifier(request)
+    limit, window = _AUTH_ACTION_LIMITS.get(action, _GENERAL_LIMIT)
+    checks = [(f"{action}:{identifier}", limit, window)]
     
-    if action == "login":
-        limit = settings.LOGIN_RATE_LIMIT
-        window = settings.LOGIN_RATE_WINDOW
-    elif action == "registration":
-        limit = settings.REGISTRATION_RATE_LIMIT
-        window = settings.REGISTRATION_RATE_WINDOW
-    else:
-        limit = settings.GENERAL_RATE_LIMIT
-        window = settings.GENERAL_RATE_WINDOW
+    if account and action in _ACCOUNT_ACTION_LIMITS:
+        account_limit, account_window = _ACCOUNT_ACTION_LIMITS[action]
+        # Hashed so email addresses are not stored in Redis key names
+        account_id = hashlib.blake2b(account.strip().lower().encode(), digest_size=16).hexdigest()
+        checks.append((f"{action}:account:{account_id}", account_limit, account_window))
     
     try:
-        is_limited, info = await rate_limiter.is_rate_limited(
-            identifier=identifier,
-            limit=limit,
-            window=window,
-            action=action
-        )
+        is_limited, info = await rate_limiter.check_many(checks)
         
         if is_limited:
             raise RateLimitError(
                 message=f"Too many {action} attempts",
                 retry_after=info.get("retry_after"),
-                limit=limit,
-                window=window
+                limit=info.get("limit", limit),
+                window=info.get("window", window)
             )
         
         return True
@@ -230,4 +348,41 @@ async def check_authentication_rate_limit(request: Request, action: str) -> bool
     except Exception as e:
         logger.error("Error checking authentication rate limit: %s", e)
         # Fail open - allow request if rate limiter fails
-        return True
\ No newline at end of file
+        return True
+
+
+def check_user_rate_limit(user_id: str, action: str) -> bool:
+    """
+    Check rate limit for an authenticated user.
+    
+    Authenticated endpoints are limited per user in process rather than per
+    IP in Redis, keeping them free of rate limiting round trips.
+    
+    Args:
+        user_id: Authenticated user ID
+        action: Action type ("change_password", "refresh", etc.)
+        
+    Returns:
+        True if allowed
+        
+    Raises:
+        RateLimitError: If rate limit exceeded
+    """
+    limit, window = _USER_ACTION_LIMITS.get(action, _GENERAL_LIMIT)
+    
+    is_limited, info = local_rate_limiter.is_rate_limited(
+        identifier=user_id,
+        limit=limit,
+        window=window,
+        action=action
+    )
+    
+    if is_limited:
+        raise RateLimitError(
+            message=f"Too many {action.replace('_', ' ')} attempts",
+            retry_after=info.get("retry_after"),
+            limit=limit,
+            window=window
+        )
+    
+    return True
@@ -1,13 +1,23 @@
 """
 Redis client for token blacklisting and session management.
 """
+import asyncio
 import logging
-from typing import Optional
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
 import redis.asyncio as redis
+from redis.utils import HIREDIS_AVAILABLE
+from app.core.auth import get_token_id
 from app.core.config import settings
+from app.utils.bloom_filter import BloomFilter
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds a confirmed blacklist answer for a Bloom filter hit is reused
+BLACKLIST_CHECK_CACHE_TTL = 30
+
 # Global Redis connection pool
 redis_pool: Optional[redis.ConnectionPool] = None
 redis_client: Optional[redis.Redis] = None
@@ -32,13 +42,17 @@ async def get_redis_client() -> redis.Redis:
                 max_connections=settings.REDIS_MAX_CONNECTIONS,
                 retry_on_timeout=True,
                 socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
-                socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL
             )
             redis_client = redis.Redis(connection_pool=redis_pool)
             
             # Test connection
             await redis_client.ping()
-            logger.info("Redis connection established successfully")
+            logger.info(
+                "Redis connection established successfully (%s)",
+                "hiredis parser" if HIREDIS_AVAILABLE else "pure-Python parser; install hiredis"
+            )
             
         except Exception as e:
             logger.error("Failed to connect to Redis: %s", e)
@@ -47,6 +61,21 @@ async def get_redis_client() -> redis.Redis:
     return redis_client
 
 
+async def test_redis_connection() -> bool:
+    """
+    Check Redis connectivity with a PING on the shared client.
+    
+    Returns:
+        True if Redis answered, False otherwise
+    """
+    try:
+        client = await get_redis_client()
+        return bool(await client.ping())
+    except Exception as e:
+        logger.warning("Redis health check failed: %s", e)
+        return False
+
+
 async def close_redis_connection():
     """Close Redis connection and cleanup resources."""
     global redis_pool, redis_client
@@ -63,31 +92,70 @@ async def close_redis_connection():
 
 
 class TokenBlacklist:
-    """Token blacklisting service using Redis."""
+    """
+    Token blacklisting service using Redis.
+    
+    Each worker keeps a local Bloom filter of revoked token IDs, kept in sync
+    through a Redis pub/sub channel, so the common case (token not revoked)
+    is answered without a Redis round-trip. Filter hits are confirmed in
+    Redis and the answer is cached briefly, so a false positive does not
+    cost a round-trip on every request; revocation events evict it. While
+    the filter is not in sync every check goes to Redis.
+    """
     
     def __init__(self):
         self.prefix = "blacklist:token:"
+        self.channel = "blacklist:events"
+        self._filter = self._new_filter()
+        self._filter_ready = False
+        self._checked = TTLCache(maxsize=65536, ttl=BLACKLIST_CHECK_CACHE_TTL)
+        # Bumped on every revocation event, so a check that raced one is not cached
+        self._revocations = 0
+    
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        """Create an empty revocation filter."""
+        return BloomFilter(capacity=settings.TOKEN_BLACKLIST_FILTER_CAPACITY)
     
-    async def add_token(self, token: str, ttl: int = None) -> bool:
+    async def add_token(self, token_id: str, ttl: int = None) -> bool:
         """
         Add token to blacklist.
         
         Args:
-            token: JWT token to blacklist
+            token_id: Token identifier (JWT ``jti`` claim) to blacklist
             ttl: Time to live in seconds (default: from config)
             
+        Returns:
+            True if successful, False otherwise
+        """
+        return await self.add_tokens({token_id: ttl})
+    
+    async def add_tokens(self, tokens: Dict[str, Optional[int]]) -> bool:
+        """
+        Add several tokens to blacklist in a single round-trip.
+        
+        Args:
+            tokens: Mapping of token identifier to TTL in seconds
+                (falsy TTL uses the configured default)
+            
         Returns:
             True if successful, False otherwise
         """
         try:
             client = await get_redis_client()
-            ttl = ttl or settings.TOKEN_BLACKLIST_TTL
             
-            key = f"{self.prefix}{token}"
-            result = await client.setex(key, ttl, "1")
+            async with client.pipeline(transaction=False) as pipe:
+                for token_id, ttl in tokens.items():
+                    pipe.setex(f"{self.prefix}{token_id}", ttl or settings.TOKEN_BLACKLIST_TTL, "1")
+                    pipe.publish(self.channel, token_id)
+                results = await pipe.execute()
+            
+            for token_id in tokens:
+                self._filter.add(token_id)
+                self._checked.set(token_id, True)
             
-            if result:
-                logger.info("Token added to blacklist (TTL: %ds)", ttl)
+            if all(results[::2]):
+                logger.info("Added %d token(s) to blacklist", len(tokens))
                 return True
             else:
                 logger.error("Failed to add token to blacklist")
@@ -97,43 +165,77 @@ class TokenBlacklist:
             logger.error("Error adding token to blacklist: %s", e)
             return False
     
-    async def is_blacklisted(self, token: str) -> bool:
+    async def is_blacklisted(self, token_id: str) -> bool:
         """
         Check if token is blacklisted.
         
         Args:
-            token: JWT token to check
+            token_id: Token identifier (JWT ``jti`` claim) to check
             
         Returns:
             True if blacklisted, False otherwise
         """
+        cacheable = self._filter_ready
+        if cacheable:
+            if token_id not in self._filter:
+                return False
+            cached = self._checked.get(token_id)
+            if cached is not None:
+                return cached
+        
         try:
             client = await get_redis_client()
-            key = f"{self.prefix}{token}"
+            key = f"{self.prefix}{token_id}"
+            revocations = self._revocations
             
-            result = await client.exists(key)
-            return bool(result)
+            result = bool(await client.exists(key))
+            if cacheable and self._filter_ready and (result or revocations == self._revocations):
+                self._checked.set(token_id, result)
+            return result
             
         except Exception as e:
             logger.error("Error checking token blacklist: %s", e)
             # Fail securely - treat as not blacklisted if Redis fails
             return False
     
-    async def remove_token(self, token: str) -> bool:
+    async def is_token_revoked(self, token: str, payload: Dict[str, Any]) -> bool:
+        """
+        Check if a verified token has been blacklisted.
+        
+        Tokens issued before tokens carried a ``jti`` claim were blacklisted
+        under the raw token, so for those the legacy key is checked as well.
+        That fallback only matters until such tokens have expired
+        (REFRESH_TOKEN_EXPIRE_DAYS after the ``jti`` claim was introduced).
+        
+        Args:
+            token: JWT token string
+            payload: Decoded token payload
+            
+        Returns:
+            True if blacklisted, False otherwise
+        """
+        if await self.is_blacklisted(get_token_id(token, payload)):
+            return True
+        if "jti" not in payload:
+            return await self.is_blacklisted(token)
+        return False
+    
+    async def remove_token(self, token_id: str) -> bool:
         """
         Remove token from blacklist (if needed for testing).
         
         Args:
-            token: JWT token to remove
+            token_id: Token identifier (JWT ``jti`` claim) to remove
             
         Returns:
             True if successful, False otherwise
         """
         try:
             client = await get_redis_client()
-            key = f"{self.prefix}{token}"
+            key = f"{self.prefix}{token_id}"
             
             result = await client.delete(key)
+            self._checked.pop(token_id)
             return bool(result)
             
         except Exception as e:
@@ -144,6 +246,10 @@ class TokenBlacklist:
         """
         Get total number of blacklisted tokens.
         
+        Keys are counted with an incremental SCAN rather than KEYS, so Redis
+        is never blocked walking the whole keyspace in one command and the
+        key names are never collected into a list.
+        
         Returns:
             Number of blacklisted tokens
         """
@@ -151,12 +257,126 @@ class TokenBlacklist:
             client = await get_redis_client()
             pattern = f"{self.prefix}*"
             
-            keys = await client.keys(pattern)
-            return len(keys)
+            count = 0
+            async for _ in client.scan_iter(match=pattern, count=1000):
+                count += 1
+            return count
             
         except Exception as e:
             logger.error("Error getting blacklist count: %s", e)
             return 0
+    
+    async def _load_filter(self, client: redis.Redis) -> BloomFilter:
+        """Build a revocation filter from the token IDs currently in Redis."""
+        revoked = self._new_filter()
+        async for key in client.scan_iter(match=f"{self.prefix}*", count=1000):
+            if isinstance(key, bytes):
+                key = key.decode()
+            revoked.add(key[len(self.prefix):])
+        return revoked
+    
+    def _revoke_locally(self, token_id: str) -> None:
+        """Apply a revocation event to the local filter and answer cache."""
+        self._revocations += 1
+        self._filter.add(token_id)
+        self._checked.pop(token_id)
+    
+    async def run_filter_sync(self) -> None:
+        """
+        Keep the local revocation filter in sync with Redis until cancelled.
+        
+        Subscribes to blacklist events before loading existing keys so no
+        revocation is missed, and rebuilds the filter periodically so that
+        expired tokens drop out of it.
+        """
+        retry_delay = 1.0
+        while True:
+            pubsub = None
+            try:
+                client = await get_redis_client()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+                
+                self._filter = await self._load_filter(client)
+                self._filter_ready = True
+                rebuilt_at = time.monotonic()
+                retry_delay = 1.0
+                logger.info("Token blacklist filter loaded (%d tokens)", len(self._filter))
+                
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        token_id = message["data"]
+                        if isinstance(token_id, bytes):
+                            token_id = token_id.decode()
+                        self._revoke_locally(token_id)
+                    
+                    if time.monotonic() - rebuilt_at >= settings.TOKEN_BLACKLIST_FILTER_REBUILD_INTERVAL:
+                        # Events keep arriving while rebuilding; re-add them afterwards
+                        pending = []
+                        rebuilt = await self._load_filter(client)
+                        while (message := await pubsub.get_message(timeout=0)) is not None:
+                            pending.append(message["data"])
+                        self._filter = rebuilt
+                        for token_id in pending:
+                            self._revoke_locally(token_id.decode() if isinstance(token_id, bytes) else token_id)
+                        rebuilt_at = time.monotonic()
+                    
+            except asyncio.CancelledError:
+                self._filter_ready = False
+                self._checked.clear()
+                raise
+            except Exception as e:
+                self._filter_ready = False
+                # Revocations are missed while unsubscribed, so cached answers can go stale
+                self._checked.clear()
+                logger.warning(
+                    "Token blacklist filter sync failed, retrying in %.0fs: %s", retry_delay, e
+                )
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:  # pylint: disable=broad-except
+                        pass
+
+
+# Atomically refill and draw from one or more token buckets, each stored as
+# a hash of {tokens, ts}. A request is admitted only if every bucket holds a
+# token, and then draws one from each; a denied request draws from none.
+# Returns (1-based index of the first empty bucket or 0, tokens left per
+# bucket). Tokens are returned as strings because Redis truncates Lua numbers
+# to integers. A bucket expires once it would have refilled completely,
+# which is the same as it missing.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local denied = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    levels[i] = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    if denied == 0 and levels[i] < 1 then
+        denied = i
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    if denied == 0 then
+        levels[i] = levels[i] - 1
+    end
+    levels[i] = tostring(levels[i])
+    redis.call('HSET', key, 'tokens', levels[i], 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate))
+end
+return {denied, levels}
+"""
 
 
 class RateLimiter:
@@ -164,6 +384,13 @@ class RateLimiter:
     
     def __init__(self):
         self.prefix = "ratelimit:"
+        self._script = None
+    
+    def _get_script(self, client: redis.Redis):
+        """Register the rate limit script once and reuse its SHA."""
+        if self._script is None:
+            self._script = client.register_script(RATE_LIMIT_SCRIPT)
+        return self._script
     
     async def is_rate_limited(
         self, 
@@ -175,52 +402,76 @@ class RateLimiter:
         """
         Check if identifier is rate limited.
         
+        Each identifier gets a token bucket holding up to ``limit`` tokens
+        that refills continuously over ``window`` seconds, so clients can
+        burst up to the limit and then proceed at the refill rate. The
+        bucket is updated in Redis by a single script call.
+        
         Args:
             identifier: Unique identifier (IP, user ID, etc.)
-            limit: Maximum requests allowed
-            window: Time window in seconds
+            limit: Maximum burst of requests allowed
+            window: Seconds to refill a full bucket
             action: Action type for logging
             
         Returns:
             Tuple of (is_limited, info_dict)
         """
+        return await self.check_many([(f"{action}:{identifier}", limit, window)])
+    
+    async def check_many(self, checks: List[Tuple[str, int, int]]) -> Tuple[bool, Dict]:
+        """
+        Check several rate limit scopes (e.g. per IP and per account) at once.
+        
+        All buckets are checked and drawn from by one script call, so adding
+        scopes costs no extra round trips.
+        
+        Args:
+            checks: (scope key, limit, window) for each bucket
+            
+        Returns:
+            Tuple of (is_limited, info_dict), where info describes the scope
+            that denied the request, or else the one with the fewest tokens left
+        """
         try:
             client = await get_redis_client()
-            key = f"{self.prefix}{action}:{identifier}"
+            now = int(time.time() * 1000)
+            rates = [limit / (window * 1000) for _, limit, window in checks]  # tokens per millisecond
+            args = [now]
+            for (_, limit, _), rate in zip(checks, rates):
+                args.extend((limit, rate))
             
-            # Get current count
-            current_count = await client.get(key)
-            current_count = int(current_count) if current_count else 0
+            script = self._get_script(client)
+            denied, levels = await script(
+                keys=[f"{self.prefix}{key}" for key, _, _ in checks],
+                args=args,
+                client=client
+            )
+            levels = [float(level) for level in levels]
             
             # Check if rate limited
-            if current_count >= limit:
-                ttl = await client.ttl(key)
+            denied = int(denied)
+            if denied:
+                index = denied - 1
+                key, limit, window = checks[index]
+                retry_after = math.ceil((1 - levels[index]) / (rates[index] * 1000))
                 logger.warning(
-                    "Rate limit exceeded for %s: %d/%d requests (resets in %ds)",
-                    identifier, current_count, limit, ttl
+                    "Rate limit exceeded for %s: %d requests per %ds (retry in %ds)",
+                    key, limit, window, retry_after
                 )
                 return True, {
                     "limited": True,
-                    "current_count": current_count,
                     "limit": limit,
-                    "reset_time": ttl,
-                    "retry_after": ttl
+                    "window": window,
+                    "reset_time": retry_after,
+                    "retry_after": retry_after
                 }
             
-            # Increment counter
-            pipe = client.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, window)
-            await pipe.execute()
-            
-            new_count = current_count + 1
-            remaining = limit - new_count
-            
+            index = levels.index(min(levels))
+            _, limit, window = checks[index]
             return False, {
                 "limited": False,
-                "current_count": new_count,
                 "limit": limit,
-                "remaining": remaining,
+                "remaining": int(levels[index]),
                 "reset_time": window
             }
             
@@ -0,0 +1,125 @@
+"""
+In-process caches of users and serialized user profiles for hot authenticated endpoints.
+"""
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models.user import User
+from app.schemas.auth import UserResponse
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class UserResponseCache:
+    """
+    Bounded TTL cache of ``UserResponse`` JSON bytes keyed by user ID.
+
+    Entries are tagged with the row's ``updated_at`` so that any write to the
+    user row naturally misses the cache, even before explicit invalidation.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30.0):
+        """
+        Initialize user response cache.
+
+        Args:
+            maxsize: Maximum number of cached users
+            ttl: Time to live in seconds for each entry
+        """
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_or_serialize(self, user: User) -> bytes:
+        """
+        Get serialized profile for user, serializing it on a cache miss.
+
+        Args:
+            user: Authenticated user object
+
+        Returns:
+            JSON-encoded ``UserResponse`` bytes
+        """
+        key = str(user.id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == user.updated_at:
+            return entry[1]
+
+        payload = UserResponse.model_validate(user).model_dump_json().encode()
+        self._entries.set(key, (user.updated_at, payload))
+        return payload
+
+    def invalidate(self, user_id: Any) -> None:
+        """
+        Drop cached profile for a user.
+
+        Args:
+            user_id: User ID whose cached profile should be removed
+        """
+        self._entries.pop(str(user_id))
+
+    def clear(self) -> None:
+        """Remove all cached profiles."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Column snapshots of active users loaded by the auth dependencies (seconds).
+# The TTL bounds how long other workers may see a stale is_active/is_verified.
+# The password hash is never cached; code that checks it loads it fresh.
+USER_CACHE_TTL = 30
+_USER_COLUMNS = tuple(
+    attr.key for attr in inspect(User).column_attrs if attr.key != "hashed_password"
+)
+_user_rows = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+
+
+def cache_user(user: User) -> None:
+    """
+    Cache a snapshot of a user's column values.
+
+    Args:
+        user: Loaded user object
+    """
+    _user_rows.set(str(user.id), tuple(getattr(user, key) for key in _USER_COLUMNS))
+
+
+def get_cached_user(user_id: Any) -> Optional[User]:
+    """
+    Get a detached user rebuilt from its cached snapshot.
+
+    The result is a fresh object each call; merge it into a session with
+    ``load=False`` to use it like a loaded row without a SELECT.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Detached user object, or None on a miss
+    """
+    row = _user_rows.get(str(user_id))
+    if row is None:
+        return None
+
+    user = User(**dict(zip(_USER_COLUMNS, row)))
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user(user_id: Any) -> None:
+    """
+    Drop cached data for a user after their row changes.
+
+    Args:
+        user_id: User ID
+    """
+    _user_rows.pop(str(user_id))
+    user_response_cache.invalidate(user_id)
+
+
+# Global instance
+user_response_cache = UserResponseCache()
@@ -1,6 +1,7 @@
 """
 Database models for the application.
 """
+from .base import Base
 from .user import User
 
-__all__ = ["User"]
\ No newline at end of file
+__all__ = ["Base", "User"]
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""
+Declarative base class shared by all database models.
+"""
+from sqlalchemy.ext.declarative import declarative_base
+
+# Create base class for models
+Base = declarative_base()
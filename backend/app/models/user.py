@@ -10,7 +10,8 @@ from datetime import datetime
 import uuid
 from typing import Optional
 
-from app.core.database import Base
+from app.models.base import Base
+from app.core.encryption import encrypt_secret, decrypt_secret
 
 
 class User(Base):
@@ -119,4 +120,23 @@ class User(Base):
         """Check if Instagram access token has expired."""
         if self.token_expires_at is None:
             return True
-        return datetime.utcnow() >= self.token_expires_at
\ No newline at end of file
+        return datetime.utcnow() >= self.token_expires_at
+    
+    def set_instagram_access_token(self, token: Optional[str]) -> None:
+        """
+        Store Instagram access token encrypted and bound to this user's ID.
+        
+        Raises:
+            ValueError: If the user has no ID yet
+        """
+        if self.id is None:
+            raise ValueError("User must have an ID before storing an Instagram token")
+        self.instagram_access_token = (
+            encrypt_secret(token, str(self.id)) if token is not None else None
+        )
+    
+    def get_instagram_access_token(self) -> Optional[str]:
+        """Get decrypted Instagram access token, or None if unset or unreadable."""
+        if self.instagram_access_token is None:
+            return None
+        return decrypt_secret(self.instagram_access_token, str(self.id))
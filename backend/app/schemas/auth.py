@@ -1,7 +1,7 @@
 """
 Authentication schemas for request/response validation.
 """
-from pydantic import BaseModel, EmailStr, field_validator, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
@@ -65,8 +65,7 @@ class UserResponse(BaseModel):
     created_at: datetime = Field(..., description="Account creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserRegistrationResponse(BaseModel):
@@ -135,6 +134,8 @@ class AuthErrorResponse(BaseModel):
     
 class TokenPayload(BaseModel):
     """JWT token payload schema."""
+    model_config = ConfigDict(frozen=True)
+    
     sub: str = Field(..., description="Subject (user ID)")
     exp: int = Field(..., description="Expiration timestamp")
     type: Optional[str] = Field(None, description="Token type (access/refresh)")
@@ -97,6 +97,7 @@ class HealthResponse(BaseModel):
         description="Status of individual services"
     )
     response_time_ms: Optional[float] = Field(None, description="Total health check response time in milliseconds")
+    cached: bool = Field(False, description="Whether service statuses were reused from a check in the last second")
 
 
 class HealthCheckResponse(BaseModel):
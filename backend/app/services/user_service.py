@@ -2,15 +2,18 @@
 User service for authentication and user management operations.
 """
 import logging
-from typing import Optional
-from uuid import uuid4
+from typing import NamedTuple, Optional, Union
+from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.schemas.auth import UserRegisterRequest, UserLoginRequest
-from app.core.auth import hash_password, verify_password, validate_password_strength
+from app.core.auth import get_dummy_password_hash, validate_password_strength
+from app.core.hash_pool import hash_password_async, verify_password_async
+from app.core.user_cache import invalidate_user
 from app.utils.exceptions import (
     UserAlreadyExistsError, InvalidCredentialsError, PasswordTooWeakError,
     AccountInactiveError, DatabaseException
@@ -19,6 +22,21 @@ from app.utils.exceptions import (
 logger = logging.getLogger(__name__)
 
 
+class AuthenticatedUser(NamedTuple):
+    """Narrow projection of a user row loaded for login."""
+    id: UUID
+    email: str
+    hashed_password: str
+    full_name: Optional[str]
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+AUTHENTICATED_USER_COLUMNS = tuple(getattr(User, field) for field in AuthenticatedUser._fields)
+
+
 class UserService:
     """Service class for user operations."""
     
@@ -46,27 +64,35 @@ class UserService:
             if not is_valid:
                 raise PasswordTooWeakError(message)
             
-            # Check if user already exists
-            existing_user = await self.get_user_by_email(user_data.email)
-            if existing_user:
+            # Reject known emails before spending a bcrypt round on the password
+            email = user_data.email.lower().strip()
+            existing = await self.db.execute(select(User.id).where(User.email == email))
+            if existing.first() is not None:
                 raise UserAlreadyExistsError()
             
             # Hash password
-            hashed_password = hash_password(user_data.password)
+            hashed_password = await hash_password_async(user_data.password)
             
-            # Create user
-            user = User(
-                id=str(uuid4()),
-                email=user_data.email.lower().strip(),
-                hashed_password=hashed_password,
-                full_name=user_data.full_name.strip() if user_data.full_name else None,
-                is_active=True,
-                is_verified=False  # Email verification required
+            # Insert user; the unique email index still guards concurrent registrations
+            stmt = (
+                pg_insert(User)
+                .values(
+                    id=uuid4(),
+                    email=email,
+                    hashed_password=hashed_password,
+                    full_name=user_data.full_name.strip() if user_data.full_name else None,
+                    is_active=True,
+                    is_verified=False  # Email verification required
+                )
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User)
             )
+            result = await self.db.execute(stmt)
+            user = result.scalar_one_or_none()
+            if user is None:
+                raise UserAlreadyExistsError()
             
-            self.db.add(user)
             await self.db.commit()
-            await self.db.refresh(user)
             
             logger.info("Created new user account: %s", user.email)
             return user
@@ -83,7 +109,7 @@ class UserService:
             logger.error("Error creating user: %s", e)
             raise DatabaseException("Failed to create user account") from e
     
-    async def authenticate_user(self, login_data: UserLoginRequest) -> User:
+    async def authenticate_user(self, login_data: UserLoginRequest) -> AuthenticatedUser:
         """
         Authenticate user credentials.
         
@@ -91,7 +117,7 @@ class UserService:
             login_data: User login credentials
             
         Returns:
-            User object
+            AuthenticatedUser projection of the user row
             
         Raises:
             InvalidCredentialsError: If credentials are invalid
@@ -99,22 +125,30 @@ class UserService:
             DatabaseException: If database operation fails
         """
         try:
-            # Get user by email
-            user = await self.get_user_by_email(login_data.email)
-            if not user:
+            # Load only the columns needed to authenticate and respond
+            stmt = select(*AUTHENTICATED_USER_COLUMNS).where(
+                User.email == login_data.email.lower().strip()
+            )
+            row = (await self.db.execute(stmt)).first()
+            if row is None:
+                # Spend a bcrypt round anyway so unknown emails can't be timed
+                await verify_password_async(login_data.password, get_dummy_password_hash())
                 raise InvalidCredentialsError()
+            user = AuthenticatedUser(*row)
             
             # Check if user is active
             if not user.is_active:
                 raise AccountInactiveError()
             
             # Verify password
-            if not verify_password(login_data.password, user.hashed_password):
+            if not await verify_password_async(login_data.password, user.hashed_password):
                 logger.warning("Failed login attempt for user: %s", login_data.email)
                 raise InvalidCredentialsError()
             
             # Update last login time
-            await self.update_last_login(user)
+            login_time = datetime.utcnow()
+            if await self.update_last_login(user, login_time):
+                user = user._replace(updated_at=login_time)
             
             logger.info("User authenticated successfully: %s", user.email)
             return user
@@ -161,19 +195,43 @@ class UserService:
             logger.error("Error getting user by ID: %s", e)
             return None
     
-    async def update_last_login(self, user: User) -> bool:
+    async def _update_user_fields(self, user: Union[User, AuthenticatedUser], **values) -> None:
+        """
+        Persist column values for a user with a single UPDATE statement.
+        
+        The ORM synchronizes the matching in-session user object, so callers
+        can keep using it without a refresh.
+        
+        Args:
+            user: User object or authenticated user projection
+            **values: Column values to set
+        """
+        values.setdefault("updated_at", datetime.utcnow())
+        stmt = update(User).where(User.id == user.id).values(**values)
+        await self.db.execute(stmt)
+        await self.db.commit()
+        invalidate_user(user.id)
+    
+    async def update_last_login(
+        self,
+        user: Union[User, AuthenticatedUser],
+        login_time: Optional[datetime] = None
+    ) -> bool:
         """
         Update user's last login timestamp.
         
         Args:
-            user: User object
+            user: User object or authenticated user projection
+            login_time: Login timestamp (default: now)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            user.last_login_at = datetime.utcnow()
-            await self.db.commit()
+            login_time = login_time or datetime.utcnow()
+            await self._update_user_fields(
+                user, last_login_at=login_time, updated_at=login_time
+            )
             return True
         except Exception as e:
             await self.db.rollback()
@@ -191,8 +249,7 @@ class UserService:
             True if successful, False otherwise
         """
         try:
-            user.is_active = True
-            await self.db.commit()
+            await self._update_user_fields(user, is_active=True)
             logger.info("User account activated: %s", user.email)
             return True
         except Exception as e:
@@ -211,8 +268,7 @@ class UserService:
             True if successful, False otherwise
         """
         try:
-            user.is_active = False
-            await self.db.commit()
+            await self._update_user_fields(user, is_active=False)
             logger.info("User account deactivated: %s", user.email)
             return True
         except Exception as e:
@@ -231,8 +287,7 @@ class UserService:
             True if successful, False otherwise
         """
         try:
-            user.is_verified = True
-            await self.db.commit()
+            await self._update_user_fields(user, is_verified=True)
             logger.info("User email verified: %s", user.email)
             return True
         except Exception as e:
@@ -258,8 +313,12 @@ class UserService:
             DatabaseException: If database operation fails
         """
         try:
+            # Users restored from the auth cache carry no password hash
+            if "hashed_password" in inspect(user).unloaded:
+                await self.db.refresh(user, ["hashed_password"])
+            
             # Verify current password
-            if not verify_password(current_password, user.hashed_password):
+            if not await verify_password_async(current_password, user.hashed_password):
                 raise InvalidCredentialsError("Current password is incorrect")
             
             # Validate new password strength
@@ -268,8 +327,9 @@ class UserService:
                 raise PasswordTooWeakError(message)
             
             # Hash new password
-            user.hashed_password = hash_password(new_password)
+            user.hashed_password = await hash_password_async(new_password)
             await self.db.commit()
+            invalidate_user(user.id)
             
             logger.info("Password changed for user: %s", user.email)
             return True
@@ -293,11 +353,16 @@ class UserService:
         Returns:
             True if successful, False otherwise
         """
+        if full_name is None:
+            return True
+        
+        new_full_name = full_name.strip() if full_name else None
+        if new_full_name == user.full_name:
+            # Nothing changed, skip the commit round trip
+            return True
+        
         try:
-            if full_name is not None:
-                user.full_name = full_name.strip() if full_name else None
-            
-            await self.db.commit()
+            await self._update_user_fields(user, full_name=new_full_name)
             logger.info("Profile updated for user: %s", user.email)
             return True
             
@@ -11,32 +11,26 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.append(str(backend_dir))
 
+from app.core.hash_pool import hash_passwords_bulk
 from app.core.database import get_async_db, create_tables
 from app.models.user import User
 from sqlalchemy.ext.asyncio import AsyncSession
-from passlib.context import CryptContext
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
-
 
 async def create_sample_users(db: AsyncSession):
     """Create sample users for development."""
     
+    admin_hash, demo_hash, test_hash = hash_passwords_bulk(["admin123", "demo123", "test123"])
+    
     sample_users = [
         {
             "email": "admin@defeah.com",
-            "hashed_password": hash_password("admin123"),
+            "hashed_password": admin_hash,
             "full_name": "Admin User",
             "is_active": True,
             "is_verified": True,
@@ -45,7 +39,7 @@ async def create_sample_users(db: AsyncSession):
         },
         {
             "email": "demo@defeah.com", 
-            "hashed_password": hash_password("demo123"),
+            "hashed_password": demo_hash,
             "full_name": "Demo User",
             "is_active": True,
             "is_verified": True,
@@ -54,7 +48,7 @@ async def create_sample_users(db: AsyncSession):
         },
         {
             "email": "test@defeah.com",
-            "hashed_password": hash_password("test123"),
+            "hashed_password": test_hash,
             "full_name": "Test User",
             "is_active": True,
             "is_verified": False,
@@ -13,7 +13,7 @@ from sqlalchemy.pool import StaticPool
 import fakeredis
 
 from app.main import app
-from app.core.database import Base, get_db, get_async_db
+from app.core.database import Base, get_db, get_async_db, get_health_db
 
 # Test database URLs with environment variable support
 SQLALCHEMY_DATABASE_URL = os.getenv(
@@ -97,6 +97,7 @@ def client(db_session):
     # Override the database dependencies
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_health_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -190,6 +191,11 @@ def mock_redis_client(redis_mock):
             """Add token to blacklist."""
             self.redis.setex(f"blacklist:{token}", ttl, "1")
         
+        async def add_tokens(self, tokens: dict) -> None:
+            """Add several tokens to blacklist."""
+            for token, ttl in tokens.items():
+                self.redis.setex(f"blacklist:{token}", ttl or 86400, "1")
+        
         async def is_blacklisted(self, token: str) -> bool:
             """Check if token is blacklisted."""
             return bool(self.redis.get(f"blacklist:{token}"))
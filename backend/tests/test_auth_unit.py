@@ -11,9 +11,13 @@ from app.core.auth import (
     create_access_token,
     create_refresh_token,
     verify_token,
+    invalidate_token,
+    get_token_id,
+    get_dummy_password_hash,
     get_password_strength_score,
     validate_password_strength
 )
+from app.core.hash_pool import hash_password_async, hash_passwords_bulk, verify_password_async
 from tests.test_utils import PasswordTestHelper
 
 
@@ -57,6 +61,21 @@ class TestPasswordHashing:
         
         assert verify_password(wrong_password, hashed) is False
     
+    @pytest.mark.unit
+    def test_verify_password_caches_success_only(self) -> None:
+        """Test successful verifications are cached and failures are not."""
+        password = "TestPassword123!"
+        hashed = hash_password(password)
+        
+        assert verify_password(password, hashed) is True
+        with patch('app.core.auth.bcrypt.checkpw') as mock_verify:
+            assert verify_password(password, hashed) is True
+            mock_verify.assert_not_called()
+            
+            mock_verify.return_value = False
+            assert verify_password("WrongPassword123!", hashed) is False
+            mock_verify.assert_called_once()
+    
     @pytest.mark.unit
     def test_verify_password_empty_password(self):
         """Test password verification with empty password."""
@@ -71,6 +90,48 @@ class TestPasswordHashing:
         password = "TestPassword123!"
         
         assert verify_password(password, "") is False
+    
+    @pytest.mark.unit
+    def test_verify_password_malformed_hash_skips_bcrypt(self) -> None:
+        """Test malformed hashes are rejected without running bcrypt."""
+        password = "TestPassword123!"
+        hashed = hash_password(password)
+        
+        with patch('app.core.auth.bcrypt.checkpw') as mock_verify:
+            assert verify_password(password, hashed[:-1]) is False
+            assert verify_password(password, "$1$" + hashed[3:]) is False
+            assert verify_password(password, "not-a-bcrypt-hash") is False
+            mock_verify.assert_not_called()
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_password_async(self) -> None:
+        """Test pooled password hashing matches the synchronous helpers."""
+        password = "TestPassword123!"
+        hashed = await hash_password_async(password)
+        
+        assert verify_password(password, hashed) is True
+        assert await verify_password_async(password, hashed) is True
+        assert await verify_password_async("WrongPassword123!", hashed) is False
+    
+    @pytest.mark.unit
+    def test_hash_passwords_bulk(self) -> None:
+        """Test bulk hashing keeps input order."""
+        passwords = ["FirstPassword1!", "SecondPassword2@", "ThirdPassword3#"]
+        hashes = hash_passwords_bulk(passwords)
+        
+        assert len(hashes) == len(passwords)
+        for password, hashed in zip(passwords, hashes):
+            assert verify_password(password, hashed) is True
+    
+    @pytest.mark.unit
+    def test_dummy_password_hash(self) -> None:
+        """Test dummy hash is a stable bcrypt hash that rejects passwords."""
+        dummy_hash = get_dummy_password_hash()
+        
+        assert dummy_hash is get_dummy_password_hash()
+        assert dummy_hash.startswith("$2")
+        assert verify_password("TestPassword123!", dummy_hash) is False
 
 
 class TestJWTTokens:
@@ -192,6 +253,65 @@ class TestJWTTokens:
             
             payload = verify_token("fake_token", token_type="access")
             assert payload is None
+    
+    @pytest.mark.unit
+    def test_tokens_include_unique_jti(self):
+        """Test access and refresh tokens carry distinct jti claims."""
+        data = {"sub": "123e4567-e89b-12d3-a456-426614174000"}
+        access_payload = verify_token(create_access_token(data=data), token_type="access")
+        refresh_payload = verify_token(create_refresh_token(data=data), token_type="refresh")
+        
+        assert access_payload["jti"]
+        assert refresh_payload["jti"]
+        assert access_payload["jti"] != refresh_payload["jti"]
+    
+    @pytest.mark.unit
+    def test_get_token_id_never_returns_raw_token(self):
+        """Test tokens without a jti are identified by a fixed-size digest."""
+        token = create_access_token(data={"sub": "user_id"})
+        
+        assert get_token_id(token, {"jti": "abc"}) == "abc"
+        token_id = get_token_id(token, {})
+        assert token_id != token
+        assert len(token_id) == 32
+        assert get_token_id(token, {}) == token_id
+    
+    @pytest.mark.unit
+    def test_tokens_signed_with_configured_secret(self):
+        """Test tokens signed with the precompiled key verify against SECRET_KEY."""
+        from jose import jwt
+        from app.core.config import settings
+        
+        token = create_access_token(data={"sub": "signing-user"})
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        
+        assert payload["sub"] == "signing-user"
+    
+    @pytest.mark.unit
+    def test_verify_token_caches_result(self):
+        """Test repeated verification of the same token skips decoding."""
+        token = create_access_token(data={"sub": "cached-user"})
+        first = verify_token(token, token_type="access")
+        
+        with patch('app.core.auth.jwt.decode') as mock_decode:
+            second = verify_token(token, token_type="access")
+            mock_decode.assert_not_called()
+        
+        assert second == first
+        assert second is not first  # Callers get their own copy
+        # Cache is keyed by token type as well
+        assert verify_token(token, token_type="refresh") is None
+    
+    @pytest.mark.unit
+    def test_invalidate_token_drops_cached_result(self):
+        """Test invalidated tokens are decoded again on the next verification."""
+        token = create_access_token(data={"sub": "invalidated-user"})
+        payload = verify_token(token, token_type="access")
+        
+        invalidate_token(token)
+        with patch('app.core.auth.jwt.decode', return_value=payload) as mock_decode:
+            verify_token(token, token_type="access")
+            mock_decode.assert_called_once()
 
 
 class TestPasswordStrength:
@@ -312,6 +432,18 @@ class TestPasswordStrength:
         assert is_valid is True
         assert "meets security requirements" in message
     
+    @pytest.mark.unit
+    @patch('app.core.auth.settings')
+    def test_validate_password_strength_maximum_score(self, mock_settings):
+        """Test that long passwords with all character types pass any threshold."""
+        mock_settings.PASSWORD_MIN_LENGTH = 8
+        mock_settings.PASSWORD_MAX_LENGTH = 128
+        mock_settings.PASSWORD_STRENGTH_THRESHOLD = 100
+        
+        is_valid, _ = validate_password_strength("LongTestPassword123!")
+        assert is_valid is True
+        assert get_password_strength_score("LongTestPassword123!") == 100
+    
     @pytest.mark.unit
     def test_password_strength_edge_cases(self):
         """Test password strength calculation edge cases."""
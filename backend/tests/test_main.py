@@ -52,4 +52,27 @@ def test_api_v1_health(client: TestClient):
     
     data = response.json()
     assert data["status"] == "healthy"
-    assert data["version"] == "v1"
\ No newline at end of file
+    assert data["version"] == "v1"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_health_service_checks_are_cached():
+    """Test /health service checks are reused within the cache TTL."""
+    from unittest.mock import AsyncMock, patch
+    from app.main import _HealthCache
+    
+    health_cache = _HealthCache()
+    db_check = AsyncMock(return_value=True)
+    redis_check = AsyncMock(return_value=False)
+    with patch("app.main.check_database_connection", db_check), \
+            patch("app.main.test_redis_connection", redis_check):
+        db_result, redis_result, cached = await health_cache.check_services()
+        assert (db_result["status"], redis_result["status"], cached) == ("healthy", "unhealthy", False)
+        
+        assert (await health_cache.check_services())[2] is True
+        
+        with patch("app.main.HEALTH_CACHE_TTL", 0):
+            assert (await health_cache.check_services())[2] is False
+    
+    assert db_check.await_count == redis_check.await_count == 2
@@ -86,4 +86,42 @@ def test_user_model_repr(db_session: Session):
     repr_str = repr(user)
     assert "User" in repr_str
     assert str(user.id) in repr_str
-    assert user.email in repr_str
\ No newline at end of file
+    assert user.email in repr_str
+
+
+@pytest.mark.unit
+def test_user_instagram_token_encryption():
+    """Test Instagram access token is stored encrypted and bound to the user."""
+    user = User(id=uuid.uuid4(), email="encrypted@example.com", hashed_password="hashed_password_here")
+    user.set_instagram_access_token("instagram_token_here")
+    
+    assert user.instagram_access_token != "instagram_token_here"
+    assert user.get_instagram_access_token() == "instagram_token_here"
+    
+    # Ciphertext copied to another user must not decrypt
+    other_user = User(id=uuid.uuid4(), instagram_access_token=user.instagram_access_token)
+    assert other_user.get_instagram_access_token() is None
+    
+    user.set_instagram_access_token(None)
+    assert user.get_instagram_access_token() is None
+    
+    # The ciphertext is bound to the ID, so one must exist first
+    with pytest.raises(ValueError):
+        User(email="unsaved@example.com").set_instagram_access_token("instagram_token_here")
+
+
+@pytest.mark.unit
+def test_token_encryption_key_validation():
+    """Test the encryption key format is checked and only defaulted in DEBUG."""
+    import base64
+    from pydantic import ValidationError
+    from app.core.config import Settings
+    
+    key = base64.b64encode(b"k" * 32).decode()
+    assert Settings(DEBUG=False, TOKEN_ENCRYPTION_KEY=key).TOKEN_ENCRYPTION_KEY == key
+    assert Settings(DEBUG=False, TOKEN_ENCRYPTION_KEY="").TOKEN_ENCRYPTION_KEY is None
+    assert Settings(DEBUG=True, TOKEN_ENCRYPTION_KEY="").TOKEN_ENCRYPTION_KEY
+    
+    for invalid in ("your-base64-encryption-key-here", base64.b64encode(b"short").decode()):
+        with pytest.raises(ValidationError, match="TOKEN_ENCRYPTION_KEY"):
+            Settings(DEBUG=False, TOKEN_ENCRYPTION_KEY=invalid)
@@ -287,6 +287,220 @@ class TestRateLimitingWithRedisValidation:
         assert redis_mock.get(key) is None
 
 
+class TestTokenBlacklistService:
+    """Test TokenBlacklist against an in-memory Redis."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_add_tokens_uses_jti_keys(self) -> None:
+        """Test blacklisting several token IDs in one pipeline."""
+        import fakeredis
+        from app.core.redis_client import TokenBlacklist
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        token_blacklist = TokenBlacklist()
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ):
+            assert await token_blacklist.add_tokens({"access-jti": 60, "refresh-jti": 0})
+            
+            assert await token_blacklist.is_blacklisted("access-jti") is True
+            assert await token_blacklist.is_blacklisted("refresh-jti") is True
+            assert await token_blacklist.is_blacklisted("other-jti") is False
+            
+            with patch.object(async_redis_mock, "keys", AsyncMock()) as mock_keys:
+                assert await token_blacklist.get_blacklist_count() == 2
+                mock_keys.assert_not_called()
+        
+        assert 0 < await async_redis_mock.ttl("blacklist:token:access-jti") <= 60
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_legacy_raw_token_keys_still_revoke(self) -> None:
+        """Test tokens without a jti blacklisted under the raw token stay revoked."""
+        import fakeredis
+        from app.core.redis_client import TokenBlacklist
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        legacy_token = "legacy.header.signature"
+        await async_redis_mock.setex(f"blacklist:token:{legacy_token}", 60, "1")
+        token_blacklist = TokenBlacklist()
+        
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ):
+            assert await token_blacklist.is_token_revoked(legacy_token, {"sub": "user_id"}) is True
+            assert await token_blacklist.is_token_revoked("other.header.signature", {"sub": "user_id"}) is False
+            # Tokens with a jti are only looked up by it
+            assert await token_blacklist.is_token_revoked(legacy_token, {"jti": "fresh-jti"}) is False
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_local_filter_skips_redis_for_unrevoked_tokens(self) -> None:
+        """Test synced filter answers misses locally and confirms hits in Redis."""
+        import asyncio
+        import fakeredis
+        from app.core.redis_client import TokenBlacklist
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        await async_redis_mock.setex("blacklist:token:existing-jti", 60, "1")
+        token_blacklist = TokenBlacklist()
+        
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ):
+            sync_task = asyncio.create_task(token_blacklist.run_filter_sync())
+            try:
+                for _ in range(50):
+                    if token_blacklist._filter_ready:
+                        break
+                    await asyncio.sleep(0.01)
+                assert token_blacklist._filter_ready
+                
+                assert await token_blacklist.is_blacklisted("existing-jti") is True
+                await token_blacklist.add_token("new-jti", 60)
+                assert await token_blacklist.is_blacklisted("new-jti") is True
+                
+                with patch.object(async_redis_mock, "exists", AsyncMock()) as mock_exists:
+                    assert await token_blacklist.is_blacklisted("unrevoked-jti") is False
+                    mock_exists.assert_not_called()
+            finally:
+                sync_task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await sync_task
+        
+        assert token_blacklist._filter_ready is False
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_filter_false_positive_cached_until_revoked(self) -> None:
+        """Test confirmed filter hits are cached and evicted by revocation events."""
+        import asyncio
+        import fakeredis
+        from app.core.redis_client import TokenBlacklist
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        token_blacklist = TokenBlacklist()
+        other_worker = TokenBlacklist()
+        
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ):
+            sync_task = asyncio.create_task(token_blacklist.run_filter_sync())
+            try:
+                for _ in range(50):
+                    if token_blacklist._filter_ready:
+                        break
+                    await asyncio.sleep(0.01)
+                assert token_blacklist._filter_ready
+                
+                # Simulate a Bloom filter false positive
+                token_blacklist._filter.add("unlucky-jti")
+                assert await token_blacklist.is_blacklisted("unlucky-jti") is False
+                with patch.object(async_redis_mock, "exists", AsyncMock()) as mock_exists:
+                    assert await token_blacklist.is_blacklisted("unlucky-jti") is False
+                    mock_exists.assert_not_called()
+                
+                await other_worker.add_token("unlucky-jti", 60)
+                for _ in range(50):
+                    if token_blacklist._revocations:
+                        break
+                    await asyncio.sleep(0.01)
+                assert await token_blacklist.is_blacklisted("unlucky-jti") is True
+            finally:
+                sync_task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await sync_task
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_rate_limiter_drains_bucket_and_expires_when_full(self) -> None:
+        """Test the bucket denies once empty and expires once it would be full."""
+        pytest.importorskip("lupa")
+        import fakeredis
+        from app.core.redis_client import RateLimiter
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        rate_limiter = RateLimiter()
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ):
+            results = [
+                await rate_limiter.is_rate_limited("10.0.0.5", limit=2, window=60, action="login")
+                for _ in range(3)
+            ]
+        
+        assert [limited for limited, _ in results] == [False, False, True]
+        assert [info["remaining"] for _, info in results[:2]] == [1, 0]
+        # One token refills every 30 seconds
+        assert 0 < results[2][1]["retry_after"] <= 30
+        
+        tokens, ts = await async_redis_mock.hmget("ratelimit:login:10.0.0.5", "tokens", "ts")
+        assert 0 <= float(tokens) < 1 and int(ts) > 0
+        assert 0 < await async_redis_mock.pttl("ratelimit:login:10.0.0.5") <= 60_000
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_rate_limiter_refills_bucket(self) -> None:
+        """Test an exhausted bucket admits requests again as it refills."""
+        pytest.importorskip("lupa")
+        import fakeredis
+        from app.core.redis_client import RateLimiter
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        rate_limiter = RateLimiter()
+        
+        async def check_at(now: float):
+            with patch('app.core.redis_client.time.time', return_value=now):
+                return await rate_limiter.is_rate_limited("10.0.0.1", limit=4, window=60, action="login")
+        
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ):
+            burst = [await check_at(1000.0) for _ in range(5)]
+            # One token refills every 15 seconds
+            early = await check_at(1010.0)
+            refilled = await check_at(1015.0)
+        
+        assert [limited for limited, _ in burst] == [False, False, False, False, True]
+        assert burst[4][1]["retry_after"] == 15
+        assert early[0] is True and early[1]["retry_after"] == 5
+        assert refilled[0] is False and refilled[1]["remaining"] == 0
+    
+    @pytest.mark.asyncio
+    @pytest.mark.integration
+    async def test_rate_limiter_checks_scopes_together(self) -> None:
+        """Test a request denied by one scope draws from none of them."""
+        pytest.importorskip("lupa")
+        import fakeredis
+        from app.core.redis_client import RateLimiter
+        
+        async_redis_mock = fakeredis.FakeAsyncRedis(decode_responses=True)
+        rate_limiter = RateLimiter()
+        ip_scope = ("login:10.0.0.2", 3, 60)
+        account_scope = ("login:account:user@example.com", 1, 900)
+        
+        with patch(
+            'app.core.redis_client.get_redis_client',
+            AsyncMock(return_value=async_redis_mock)
+        ), patch('app.core.redis_client.time.time', return_value=2000.0):
+            first = await rate_limiter.check_many([ip_scope, account_scope])
+            second = await rate_limiter.check_many([ip_scope, account_scope])
+            other_account = await rate_limiter.check_many([ip_scope])
+        
+        # The tightest scope is reported while allowed, the denying one after
+        assert first == (False, {"limited": False, "limit": 1, "remaining": 0, "reset_time": 900})
+        assert second[0] is True
+        assert (second[1]["limit"], second[1]["window"], second[1]["retry_after"]) == (1, 900, 900)
+        assert other_account[0] is False and other_account[1]["remaining"] == 1
+
+
 class MockRateLimiter:
     """Mock rate limiter for testing."""
     
@@ -322,6 +322,81 @@ class TestRateLimitingBehavior:
             
             # Verify the rate limit function was called
             mock_rate_limit.assert_called()
+    
+    @pytest.mark.security
+    def test_local_rate_limiter_per_user(self) -> None:
+        """Test the in-process limiter limits each user independently."""
+        from app.core.rate_limiting import LocalRateLimiter
+        
+        limiter = LocalRateLimiter()
+        results = [
+            limiter.is_rate_limited("user-1", limit=2, window=60, action="change_password")
+            for _ in range(3)
+        ]
+        
+        assert [limited for limited, _ in results] == [False, False, True]
+        assert results[2][1]["retry_after"] > 0
+        assert limiter.is_rate_limited("user-2", limit=2, window=60)[0] is False
+    
+    @pytest.mark.security
+    def test_local_rate_limiter_is_bounded(self) -> None:
+        """Test the in-process limiter evicts least recently used buckets."""
+        from app.core.rate_limiting import LocalRateLimiter
+        
+        limiter = LocalRateLimiter(maxsize=2)
+        for user_id in ("user-1", "user-2", "user-3"):
+            limiter.is_rate_limited(user_id, limit=1, window=60)
+        
+        assert len(limiter._buckets) == 2
+        assert limiter.is_rate_limited("user-1", limit=1, window=60)[0] is False
+    
+    @pytest.mark.security
+    @pytest.mark.asyncio
+    async def test_login_account_scope_shared_across_ips_and_hashed(self) -> None:
+        """Test the per-account login scope is shared by all IPs and hides the email."""
+        from unittest.mock import AsyncMock
+        from starlette.requests import Request
+        from app.core.rate_limiting import check_authentication_rate_limit
+        
+        check_many = AsyncMock(return_value=(False, {"limited": False}))
+        account_keys = []
+        for ip, email in (("10.0.0.3", " Victim@Example.com"), ("10.0.0.4", "victim@example.com")):
+            request = Request({"type": "http", "headers": [], "client": (ip, 1234)})
+            with patch("app.core.rate_limiting.rate_limiter.check_many", check_many):
+                assert await check_authentication_rate_limit(request, "login", account=email)
+            
+            (checks,), _ = check_many.call_args
+            assert checks[0][0] == f"login:{ip}"
+            account_keys.append(checks[1][0])
+        
+        assert account_keys[0] == account_keys[1]
+        assert account_keys[0].startswith("login:account:")
+        assert "victim" not in account_keys[0].lower()
+        assert "10.0.0" not in account_keys[0]
+    
+    @pytest.mark.security
+    def test_client_identifier_trusted_proxy_depth(self) -> None:
+        """Test client IPs are taken from the configured X-Forwarded-For hop."""
+        from starlette.requests import Request
+        from app.core.rate_limiting import get_client_identifier
+        
+        def make_request() -> Request:
+            return Request({
+                "type": "http",
+                "headers": [(b"x-forwarded-for", b"6.6.6.6, 1.2.3.4, 10.0.0.1")],
+                "client": ("10.0.0.2", 1234),
+            })
+        
+        assert get_client_identifier(make_request()) == "6.6.6.6"
+        for depth, expected in ((1, "10.0.0.1"), (2, "1.2.3.4"), (5, "6.6.6.6")):
+            with patch("app.core.rate_limiting.TRUSTED_PROXY_DEPTH", depth):
+                assert get_client_identifier(make_request()) == expected
+        
+        # Parsed once per request
+        request = make_request()
+        get_client_identifier(request)
+        with patch("app.core.rate_limiting.TRUSTED_PROXY_DEPTH", 1):
+            assert get_client_identifier(request) == "6.6.6.6"
 
 
 class TestPasswordSecurityFeatures:
@@ -372,4 +447,23 @@ class TestPasswordSecurityFeatures:
         # But both should verify correctly
         from app.core.auth import verify_password
         assert verify_password(password, hash1)
-        assert verify_password(password, hash2)
\ No newline at end of file
+        assert verify_password(password, hash2)
+
+
+class TestCORSConfiguration:
+    """Test CORS settings normalization."""
+    
+    @pytest.mark.security
+    def test_cors_settings_are_normalized_sets(self) -> None:
+        """Test that CORS origins, headers and methods are normalized frozensets."""
+        from app.core.config import Settings
+        
+        config = Settings(
+            BACKEND_CORS_ORIGINS=["HTTPS://App.Example.com/"],
+            CORS_ALLOW_HEADERS=["Content-Type", "content-type"],
+            CORS_ALLOW_METHODS=["get", "POST"],
+        )
+        
+        assert config.BACKEND_CORS_ORIGINS == frozenset({"https://app.example.com"})
+        assert config.CORS_ALLOW_HEADERS == frozenset({"content-type"})
+        assert config.CORS_ALLOW_METHODS == frozenset({"GET", "POST"})
@@ -0,0 +1,143 @@
+"""
+Unit tests for the serialized user profile cache.
+"""
+import asyncio
+import json
+import uuid
+import pytest
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect
+
+from app.core.deps import _get_active_user
+from app.core.user_cache import (
+    UserResponseCache, cache_user, get_cached_user, invalidate_user, user_response_cache
+)
+from app.models.user import User
+
+
+def make_user(**kwargs) -> User:
+    """Build an in-memory user object without touching the database."""
+    now = datetime.utcnow()
+    defaults = {
+        "id": uuid.uuid4(),
+        "email": "cache@example.com",
+        "full_name": "Cache User",
+        "is_active": True,
+        "is_verified": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+    defaults.update(kwargs)
+    return User(**defaults)
+
+
+class TestUserResponseCache:
+    """Test user response cache behaviour."""
+
+    @pytest.mark.unit
+    def test_serializes_user_response(self) -> None:
+        """Test cached payload matches the UserResponse schema."""
+        cache = UserResponseCache()
+        user = make_user()
+
+        payload = json.loads(cache.get_or_serialize(user))
+
+        assert payload["id"] == str(user.id)
+        assert payload["email"] == user.email
+        assert "hashed_password" not in payload
+
+    @pytest.mark.unit
+    def test_hit_returns_same_bytes(self) -> None:
+        """Test repeated lookups reuse the serialized payload."""
+        cache = UserResponseCache()
+        user = make_user()
+
+        first = cache.get_or_serialize(user)
+        second = cache.get_or_serialize(user)
+
+        assert first is second
+
+    @pytest.mark.unit
+    def test_updated_row_misses_cache(self) -> None:
+        """Test that a changed updated_at forces re-serialization."""
+        cache = UserResponseCache()
+        user = make_user()
+        cache.get_or_serialize(user)
+
+        user.full_name = "Renamed User"
+        user.updated_at = user.updated_at + timedelta(seconds=1)
+
+        payload = json.loads(cache.get_or_serialize(user))
+        assert payload["full_name"] == "Renamed User"
+
+    @pytest.mark.unit
+    def test_invalidate_and_maxsize(self) -> None:
+        """Test explicit invalidation and LRU eviction."""
+        cache = UserResponseCache(maxsize=2)
+        users = [make_user(email=f"user{i}@example.com") for i in range(3)]
+
+        for user in users:
+            cache.get_or_serialize(user)
+        assert len(cache) == 2
+
+        cache.invalidate(users[-1].id)
+        assert len(cache) == 1
+
+
+class TestUserRowCache:
+    """Test cached user snapshots used by the auth dependencies."""
+
+    @pytest.mark.unit
+    def test_cached_user_is_detached_copy(self) -> None:
+        """Test cached users come back as detached copies of the row."""
+        user = make_user(hashed_password="hashed")
+        cache_user(user)
+
+        cached = get_cached_user(str(user.id))
+
+        assert cached is not user
+        assert cached.id == user.id
+        assert cached.email == user.email
+        assert inspect(cached).detached
+        assert "hashed_password" in inspect(cached).unloaded
+
+    @pytest.mark.unit
+    def test_invalidate_user_drops_cached_data(self) -> None:
+        """Test invalidation drops both the row snapshot and the profile."""
+        user = make_user(hashed_password="hashed")
+        cache_user(user)
+        profile = user_response_cache.get_or_serialize(user)
+
+        invalidate_user(user.id)
+
+        assert get_cached_user(user.id) is None
+        assert user_response_cache.get_or_serialize(user) is not profile
+
+
+class TestActiveUserLookup:
+    """Test the auth dependency's cached, coalesced user lookup."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self) -> None:
+        """Test concurrent lookups for one user issue a single database load."""
+        user = make_user(hashed_password="hashed")
+        calls = []
+
+        class FakeSession:
+            async def get(self, model, pk):
+                calls.append(pk)
+                await asyncio.sleep(0.01)
+                return user
+
+            async def merge(self, instance, load=True):
+                return instance
+
+        results = await asyncio.gather(
+            *(_get_active_user(FakeSession(), str(user.id)) for _ in range(5))
+        )
+
+        assert len(calls) == 1
+        assert all(result.id == user.id for result in results)
+        invalidate_user(user.id)